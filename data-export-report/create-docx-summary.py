@@ -1,53 +1,272 @@
 from PIL import Image
 from docx import Document
 from docx.shared import Inches, Pt
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import glob
+import hashlib
 import io
 import os
 import re
+import time
 
-print("Generating report...")
+# Exported slice images may be BMP (FLAC3D default) or compressed formats
+IMAGE_EXTENSIONS = (".bmp", ".png", ".webp", ".jpg", ".jpeg")
+
+# Images are placed at 5.5" x 4" and downsampled to this many pixels per inch
+# before JPEG encoding (None keeps the exported resolution)
+IMG_W_IN, IMG_H_IN = 5.5, 4.0
+REPORT_DPI = 220
+
+# Processes decoding/compressing images ahead of document assembly
+# (1 = prepare images serially in this process)
+IMAGE_WORKERS = os.cpu_count() or 1
+
+# Compressed images are cached across runs, keyed by the source file and the
+# compression settings; least recently used entries go once the cache is too big
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports", ".report_cache")
+CACHE_MAX_BYTES = 2 * 1024**3
+CACHE_KEY = "stat"      # "stat": path+size+mtime (no extra read), "content": hash of the file bytes
+MAX_IMAGE_BYTES = 512000
 
 # ---------- helpers ----------
-def resize_image_to_limit(filepath, max_bytes=512000, min_quality=10):
-    with Image.open(filepath) as img:
-        quality = 95
-        while quality >= min_quality:
-            buffer = io.BytesIO()
-            img.save(buffer, format='JPEG', quality=quality)
-            if buffer.tell() <= max_bytes:
-                with open(filepath, 'wb') as f:
-                    f.write(buffer.getvalue())
-                return True
-            quality -= 5
-    return False
+def _encode_jpeg(img, quality):
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality)
+    return buffer
+
+def resize_image_to_limit(img, max_bytes=512000, min_quality=10, max_quality=95, step=5):
+    """Encode PIL image 'img' as JPEG in memory at the highest quality on the
+       max_quality, max_quality-step, ..., min_quality ladder that fits in max_bytes.
+       max_quality is tried first (usually enough once downsampled), then the ladder
+       is bisected, so at most 6 encodes instead of up to 18. Returns the buffer
+       (rewound) and whether it fits; if nothing fits, the min_quality encoding."""
+    qualities = list(range(max_quality, min_quality - 1, -step))
+    buffer = _encode_jpeg(img, qualities[0])
+    if buffer.tell() <= max_bytes:
+        buffer.seek(0)
+        return buffer, True
+
+    # file size shrinks with quality: find the first (highest) quality that fits
+    lo, hi = 1, len(qualities) - 1
+    best = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        buffer = _encode_jpeg(img, qualities[mid])
+        if buffer.tell() <= max_bytes:
+            best, hi = buffer, mid - 1
+        else:
+            lo = mid + 1
+    if best is not None:
+        best.seek(0)
+        return best, True
+    buffer.seek(0)   # last attempt was min_quality
+    return buffer, False
+
+def fit_to_placement(img, width_in=IMG_W_IN, height_in=IMG_H_IN, dpi=REPORT_DPI):
+    """Downsample 'img' to the pixel size of its placement in the report at 'dpi'.
+       Images already at or below that size are returned unchanged."""
+    if not dpi:
+        return img
+    target = (round(width_in * dpi), round(height_in * dpi))
+    if img.width <= target[0] and img.height <= target[1]:
+        return img
+    return img.resize(target, Image.LANCZOS)
+
+def image_to_jpeg_buffer(path, max_bytes=512000, dpi=REPORT_DPI):
+    """Read a slice image and return it as an in-memory JPEG no larger than max_bytes
+       (where possible), ready for run.add_picture. Nothing is written to disk."""
+    with Image.open(path) as im:
+        img = fit_to_placement(im.convert("RGB"), dpi=dpi)
+        buffer, _ = resize_image_to_limit(img, max_bytes)
+    return buffer
+
+def _cache_key(path):
+    settings = f"{MAX_IMAGE_BYTES}|{REPORT_DPI}|{IMG_W_IN}x{IMG_H_IN}|jpeg-v1"
+    h = hashlib.sha1(settings.encode())
+    if CACHE_KEY == "content":
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    else:
+        st = os.stat(path)
+        h.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+def prepare_image(path):
+    """Worker task: the JPEG bytes to embed for one slice image, from the cache
+       when the source and settings are unchanged."""
+    if not CACHE_DIR:
+        return image_to_jpeg_buffer(path, MAX_IMAGE_BYTES).getvalue()
+    cached = os.path.join(CACHE_DIR, _cache_key(path) + ".jpg")
+    try:
+        with open(cached, "rb") as f:
+            data = f.read()
+        os.utime(cached)   # mark as recently used
+        return data
+    except OSError:
+        pass
+    data = image_to_jpeg_buffer(path, MAX_IMAGE_BYTES).getvalue()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, cached)
+    return data
+
+def evict_cache(max_bytes=CACHE_MAX_BYTES):
+    """Delete least recently used cache entries until the cache fits in max_bytes."""
+    if not CACHE_DIR or not os.path.isdir(CACHE_DIR):
+        return
+    entries = [(e.stat().st_mtime, e.stat().st_size, e.path)
+               for e in os.scandir(CACHE_DIR) if e.name.endswith(".jpg")]
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def iter_prepared_images(paths, workers=IMAGE_WORKERS, max_pending=None, pool=None):
+    """Yield prepared JPEG buffers for 'paths' in order. With several workers the
+       images are prepared in a process pool, keeping at most max_pending
+       (default 4 per worker) in flight so memory stays bounded. An existing
+       'pool' (e.g. shared by concurrent reports) is used instead of a new one."""
+    if pool is None and workers <= 1:
+        for path in paths:
+            yield io.BytesIO(prepare_image(path))
+        return
+    max_pending = max_pending or workers * 4
+    own_pool = pool is None
+    if own_pool:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for path in paths:
+            pending.append(pool.submit(prepare_image, path))
+            if len(pending) >= max_pending:
+                yield io.BytesIO(pending.popleft().result())
+        while pending:
+            yield io.BytesIO(pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_pool:
+            pool.shutdown()
+
+# e.g. x_slice_max_principal_90.bmp, z_slice_max_principal_1012.5.png
+SLICE_FILENAME = re.compile(r"^([xyz])_slice_(.+)_(-?\d+(?:\.\d+)?)(\.[a-z]+)$", re.IGNORECASE)
+
+def parse_slice_filename(filename):
+    """Return (axis, quantity stem, position text) for an exported slice image, else None."""
+    m = SLICE_FILENAME.match(filename)
+    if not m or m.group(4).lower() not in IMAGE_EXTENSIONS:
+        return None
+    return m.group(1).lower(), m.group(2), m.group(3)
 
 def extract_slice_number_from_filename(filename):
-    # grabs the first integer in the filename
-    m = re.search(r"(\d+)", filename)
-    return int(m.group(1)) if m else None
+    """Slice position of an exported image (fractional positions kept), else None.
+       Names not following <axis>_slice_<quantity>_<position> use their last number."""
+    parsed = parse_slice_filename(filename)
+    if parsed:
+        text = parsed[2]
+    else:
+        m = re.findall(r"(-?\d+(?:\.\d+)?)", os.path.splitext(filename)[0])
+        if not m:
+            return None
+        text = m[-1]
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+def index_slice_folder(folder, axis=None, stem=None):
+    """One os.scandir pass over 'folder': {position: (position text, path)} for the
+       slice images matching 'axis' and quantity 'stem' (either may be None).
+       If a slice exists in several formats the earliest in IMAGE_EXTENSIONS wins."""
+    index = {}
+    rank = {}
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return index
+    for entry in entries:
+        parsed = parse_slice_filename(entry.name)
+        if not parsed or (axis and parsed[0] != axis) or (stem and parsed[1] != stem):
+            continue
+        pos = float(parsed[2])
+        ext_rank = IMAGE_EXTENSIONS.index(os.path.splitext(entry.name)[1].lower())
+        if pos not in index or ext_rank < rank[pos]:
+            index[pos] = (parsed[2], entry.path)
+            rank[pos] = ext_rank
+    return index
 
 def collect_slice_numbers(folder, pattern_prefix=None):
-    """Return sorted set of slice numbers for files in 'folder' that end with .bmp.
+    """Return set of slice positions for image files in 'folder'.
        Optionally ensure filenames start with pattern_prefix."""
     nums = set()
-    if not os.path.isdir(folder):
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
         return nums
-    for f in os.listdir(folder):
-        if not f.lower().endswith(".bmp"):
+    for entry in entries:
+        if not entry.name.lower().endswith(IMAGE_EXTENSIONS):
             continue
-        if pattern_prefix and not f.startswith(pattern_prefix):
+        if pattern_prefix and not entry.name.startswith(pattern_prefix):
             continue
-        n = extract_slice_number_from_filename(f)
+        n = extract_slice_number_from_filename(entry.name)
         if n is not None:
             nums.add(n)
     return nums
 
+# ---------- volumes ----------
+# python-docx keeps every embedded image in memory until save, so large slice
+# sets are written as several volumes, each closed once it reaches either limit
+VOLUME_MAX_PAGES = 300
+VOLUME_MAX_MB = 250
+
+def new_report_document():
+    """Empty report document with the page margins and slim caption styles."""
+    document = Document()
+    section = document.sections[0]
+    section.top_margin = section.bottom_margin = section.left_margin = section.right_margin = Inches(0.7)
+
+    # Slim captions
+    if "Caption" in document.styles:
+        cap = document.styles["Caption"]
+        cap.font.size = Pt(9)
+        cap.paragraph_format.space_before = Pt(0)
+        cap.paragraph_format.space_after = Pt(6)
+
+    if "Normal" in document.styles:
+        normal = document.styles["Normal"]
+        normal.paragraph_format.space_before = Pt(0)
+        normal.paragraph_format.space_after = Pt(0)
+    return document
+
+def volume_path(base_path, volume):
+    """xslice_figures.docx -> xslice_figures_part02.docx"""
+    root, ext = os.path.splitext(base_path)
+    return f"{root}_part{volume:02d}{ext}"
+
+def remove_stale_volumes(base_path, saved):
+    """Delete the single report or parts left over from an earlier, differently split run."""
+    root, ext = os.path.splitext(base_path)
+    for old in [base_path] + glob.glob(f"{glob.escape(root)}_part[0-9][0-9]{ext}"):
+        if old not in saved and os.path.exists(old):
+            os.remove(old)
+            print(f"Removed outdated report: {os.path.abspath(old)}")
+
 # ---------- doc builder ----------
-def generate_report(axis="x"):
+def generate_report(axis="x", workers=None, pool=None):
+    """Write the Word report for one axis; returns the saved document paths.
+       'pool' is an optional image-prep process pool shared with other reports."""
     axis = axis.lower()
     if axis not in ("x", "y", "z"):
         print("Invalid axis. Use 'x', 'y', or 'z'.")
-        return
+        return []
 
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -59,12 +278,13 @@ def generate_report(axis="x"):
         "zz":    os.path.join(script_dir, "exports", "zz_stress",     f"{axis}slice"),  # NEW
     }
 
-    filename_templates = {
-        "disp":  f"{axis}_slice_disp_{{}}.bmp",
-        "max":   f"{axis}_slice_max_principal_{{}}.bmp",
-        "min":   f"{axis}_slice_min_principal_{{}}.bmp",
-        "state": f"{axis}_slice_state_{{}}.bmp",
-        "zz":    f"{axis}_slice_zz_{{}}.bmp",  # NEW
+    # quantity part of the filenames: <axis>_slice_<stem>_<position>.<ext>
+    filename_stems = {
+        "disp":  "disp",
+        "max":   "max_principal",
+        "min":   "min_principal",
+        "state": "state",
+        "zz":    "zz",  # NEW
     }
 
     labels = {
@@ -82,86 +302,129 @@ def generate_report(axis="x"):
         ("zz",),
     ]
 
-    # Collect slice numbers PER KEY, then take union so we don’t assume all keys share the same set
-    # Optionally guard with a prefix to reduce false matches
-    per_key_numbers = {
-        k: collect_slice_numbers(folders[k])
+    # Index each folder once (position -> image), then take the union of positions
+    # so we don’t assume all keys share the same set
+    slice_index = {
+        k: index_slice_folder(folders[k], axis, filename_stems[k])
         for k in folders
     }
-    all_slice_numbers = sorted(set().union(*per_key_numbers.values()))
+    all_slice_numbers = sorted(set().union(*slice_index.values()))
     if not all_slice_numbers:
         print("No slice images found for any key; nothing to write.")
-        return
-
-    # Build the doc
-    document = Document()
-    section = document.sections[0]
-    section.top_margin = section.bottom_margin = section.left_margin = section.right_margin = Inches(0.7)
-
-    # Slim captions
-    if "Caption" in document.styles:
-        cap = document.styles["Caption"]
-        cap.font.size = Pt(9)
-        cap.paragraph_format.space_before = Pt(0)
-        cap.paragraph_format.space_after = Pt(6)
+        return []
 
-    if "Normal" in document.styles:
-        normal = document.styles["Normal"]
-        normal.paragraph_format.space_before = Pt(0)
-        normal.paragraph_format.space_after = Pt(0)
-
-    IMG_W = Inches(5.5)
-    IMG_H = Inches(4.0)
+    IMG_W = Inches(IMG_W_IN)
+    IMG_H = Inches(IMG_H_IN)
 
     total_pages = len(pages)
 
+    # Lay out the pages first so every image can be prepared ahead of assembly
+    page_plan = []
     for slice_val in all_slice_numbers:
-        slice_str = str(slice_val)
-
         for page_idx, keys in enumerate(pages, start=1):
-            # Check if at least one image exists for this page/slice; skip page if not
+            # Images present for this page/slice; skip page if none
             existing = []
             for key in keys:
-                bmp_name = filename_templates[key].format(slice_str)
-                bmp_path = os.path.join(folders[key], bmp_name)
-                if os.path.exists(bmp_path):
-                    existing.append((key, bmp_path))
+                if slice_val in slice_index[key]:
+                    slice_str, img_path = slice_index[key][slice_val]
+                    existing.append((key, img_path))
 
-            if not existing:
-                # nothing to show for this page for this slice; skip
-                continue
+            if existing:
+                page_plan.append((slice_str, page_idx, existing))
 
-            document.add_heading(f"{axis.upper()} Slice @ {slice_str}  ({page_idx}/{total_pages})", level=1)
+    # Converted to JPG in memory (to shrink doc), in page order
+    prepared = iter_prepared_images(
+        [img_path for _, _, existing in page_plan for _, img_path in existing],
+        workers=IMAGE_WORKERS if workers is None else workers, pool=pool)
 
-            table = document.add_table(rows=0, cols=1)
-            table.autofit = False
+    out_doc = os.path.join(script_dir, "exports", f"{axis}slice_figures.docx")
+    saved = []
+    document = new_report_document()
+    volume_pages = volume_bytes = 0
 
-            for key, bmp_path in existing:
-                # Convert BMP -> JPG (to shrink doc) then insert
-                jpg_path = bmp_path.replace(".bmp", ".jpg")
-                with Image.open(bmp_path) as im:
-                    im.convert("RGB").save(jpg_path, "JPEG", quality=95)
-                resize_image_to_limit(jpg_path)
+    for slice_str, page_idx, existing in page_plan:
+        # Close the current volume once it is full (never mid-page)
+        if volume_pages and (volume_pages >= VOLUME_MAX_PAGES
+                             or volume_bytes >= VOLUME_MAX_MB * 1024**2):
+            if not saved:
+                print("Report exceeds one volume; splitting into parts")
+            saved.append(volume_path(out_doc, len(saved) + 1))
+            document.save(saved[-1])
+            print(f"Word document saved as: {os.path.abspath(saved[-1])}")
+            document = new_report_document()
+            volume_pages = volume_bytes = 0
 
-                row_img = table.add_row().cells[0]
-                run = row_img.paragraphs[0].add_run()
-                run.add_picture(jpg_path, width=IMG_W, height=IMG_H)
+        document.add_heading(f"{axis.upper()} Slice @ {slice_str}  ({page_idx}/{total_pages})", level=1)
 
-                row_cap = table.add_row().cells[0]
-                row_cap.text = f"{labels[key]} – Slice {slice_str}"
-                if "Caption" in document.styles:
-                    row_cap.paragraphs[0].style = "Caption"
+        table = document.add_table(rows=0, cols=1)
+        table.autofit = False
 
-                os.remove(jpg_path)
+        for key, _ in existing:
+            jpg_buffer = next(prepared)
+            volume_bytes += len(jpg_buffer.getbuffer())
 
-            document.add_page_break()
+            row_img = table.add_row().cells[0]
+            run = row_img.paragraphs[0].add_run()
+            run.add_picture(jpg_buffer, width=IMG_W, height=IMG_H)
 
-    out_doc = os.path.join(script_dir, "exports", f"{axis}slice_figures.docx")
-    document.save(out_doc)
-    print(f"Word document saved as: {os.path.abspath(out_doc)}")
+            row_cap = table.add_row().cells[0]
+            row_cap.text = f"{labels[key]} – Slice {slice_str}"
+            if "Caption" in document.styles:
+                row_cap.paragraphs[0].style = "Caption"
+
+        document.add_page_break()
+        volume_pages += 1
+
+    saved.append(volume_path(out_doc, len(saved) + 1) if saved else out_doc)
+    document.save(saved[-1])
+    print(f"Word document saved as: {os.path.abspath(saved[-1])}")
+    remove_stale_volumes(out_doc, saved)
+    return saved
+
+
+# ---------- command line ----------
+def main(argv=None):
+    """Build the reports for the requested axes. By default all axes are built
+       concurrently (one assembly thread per axis) and share one image-prep pool,
+       so the set finishes in about the time of the slowest axis."""
+    parser = argparse.ArgumentParser(description="Build Word reports of the exported FLAC3D slices.")
+    parser.add_argument("axes", nargs="*", default=["x", "y", "z"], choices=["x", "y", "z"])
+    parser.add_argument("--workers", type=int, default=IMAGE_WORKERS,
+                        help="image-prep processes shared by all axes (1 = no pool)")
+    parser.add_argument("--sequential", action="store_true", help="build one axis at a time")
+    args = parser.parse_args(argv)
+
+    print("Generating report...")
+    timings = {}
+
+    def build(axis, pool):
+        t0 = time.perf_counter()
+        generate_report(axis, workers=args.workers, pool=pool)
+        timings[axis] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        if args.sequential or len(args.axes) == 1:
+            for axis in args.axes:
+                build(axis, pool)
+        else:
+            with ThreadPoolExecutor(max_workers=len(args.axes)) as threads:
+                for future in [threads.submit(build, axis, pool) for axis in args.axes]:
+                    future.result()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    evict_cache()
+
+    for axis in args.axes:
+        if axis in timings:
+            print(f"  {axis.upper()} report: {timings[axis]:.1f} s")
+    print(f"All reports done in {time.perf_counter() - t0:.1f} s")
 
 
-# Generate
-generate_report("x")
-generate_report("y")
-generate_report("z")
+# Generate (guarded: the image worker processes re-import this file)
+#   python create-docx-summary.py              # x, y and z concurrently
+#   python create-docx-summary.py z --sequential --workers 4
+if __name__ == "__main__":
+    main()
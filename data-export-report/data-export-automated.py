@@ -3,186 +3,137 @@
 
 import itasca as it
 import os
+import sys
+
+# repository root, for the shared slicekit helpers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from slicekit import axis_slices
+from slicekit.batch import run_batched
+from slicekit.extent import ZoneIndex
+from slicekit.jobs import run_jobs
+from slicekit.ramps import axis_ramps, report_ramps
+from slicekit.raster import RasterWriter
+from slicekit.section import ZoneMesh
+from slicekit.snapshot import export_snapshot
 
 # ------------------------------
 # Directories
 # ------------------------------
 base_dir = "./exports"
-dirs = {
-    "disp_x":  os.path.join(base_dir, "displacements",  "xslice"),
-    "disp_y":  os.path.join(base_dir, "displacements",  "yslice"),
-    "disp_z":  os.path.join(base_dir, "displacements",  "zslice"),
-    "max_x":   os.path.join(base_dir, "max_principal",  "xslice"),
-    "max_y":   os.path.join(base_dir, "max_principal",  "yslice"),
-    "max_z":   os.path.join(base_dir, "max_principal",  "zslice"),
-    "min_x":   os.path.join(base_dir, "min_principal",  "xslice"),
-    "min_y":   os.path.join(base_dir, "min_principal",  "yslice"),
-    "min_z":   os.path.join(base_dir, "min_principal",  "zslice"),
-    "state_x": os.path.join(base_dir, "zone_state",     "xslice"),
-    "state_y": os.path.join(base_dir, "zone_state",     "yslice"),
-    "state_z": os.path.join(base_dir, "zone_state",     "zslice"),
-    # σzz (effective) stress
-    "zz_x":    os.path.join(base_dir, "zz_stress",      "xslice"),
-    "zz_y":    os.path.join(base_dir, "zz_stress",      "yslice"),
-    "zz_z":    os.path.join(base_dir, "zz_stress",      "zslice"),
-}
-for p in dirs.values():
-    os.makedirs(p, exist_ok=True)
+dirs = axis_slices.slice_dirs(base_dir)   # e.g. dirs["max_x"] -> ./exports/max_principal/xslice
+axis_slices.make_dirs(base_dir)
+
+# ------------------------------
+# Export settings
+# ------------------------------
+DPI = 300
+IMAGE_FORMAT = "bmp"            # "bmp", "png", "jpg" (written by FLAC3D) or "webp" (converted)
+COMPRESS_IN_BACKGROUND = False  # FLAC3D writes BMP, a background thread converts to IMAGE_FORMAT
+REUSE_PLOT = True     # build each quantity's plot once and only move the cut plane
+BENCHMARK = False     # print per-slice wall time and a summary per export
+RESUME = True         # skip slices the manifest says are already on disk and current
+COMPILE = False       # render through generated data files (one 'program call' per batch)
+BATCH_SIZE = 100      # images per generated data file when COMPILE is on
+SKIP_EMPTY = True     # leave out (and log) planes that cut no zone of the model
+SNAPSHOT = None       # e.g. "./exports/model.snap": dump the model once for offline tools
+RASTERS = False       # keep <image>.raster.npz per slice to re-colour with python -m slicekit.raster
+GLOBAL_RAMPS = False  # one fixed ramp per quantity and export, from the zones its planes cut
+RAMP_PERCENTILES = None   # e.g. (1, 99): global ramps ignore the outlying zones
+
+# Quantities (plot title, folder, colouring and contour ramp) live in
+# slicekit/axis_slices.py; change a ramp here, e.g.
+# axis_slices.QUANTITIES["max"]["ramp"] = (0, 350000, 50000)
+# (GLOBAL_RAMPS replaces the "automatic" ramps for every export)
+
+# Zone extents, read once: planes outside the model are never rendered.
+# They cover every zone, so GLOBAL_RAMPS / RASTERS never change the planes exported;
+# the zone mesh (bricks only) keeps its own index for the ramps.
+zones = ZoneIndex.from_model(it) if SKIP_EMPTY else None
+mesh = ZoneMesh.from_model(it) if GLOBAL_RAMPS or RASTERS else None
+mesh_zones = ZoneIndex(mesh.lo, mesh.hi) if mesh is not None else None
+rasters = RasterWriter(it, mesh=mesh) if RASTERS else None
 
 # ----------------------------------------------------
-# Helper: plane parameters for a given axis and value
+# Export engine
 # ----------------------------------------------------
-def _plane_params(axis, i):
-    axis = axis.lower()
-    if axis == "x":
-        return f"({i},0,0)", "(1,0,0)", "90", "90"   # origin, normal, dip, dip_dir
-    if axis == "y":
-        return f"(0,{i},0)", "(0,1,0)", "90", "0"
-    if axis == "z":
-        # top-down view for horizontal slice
-        return f"(0,0,{i})", "(0,0,1)", "0", "0"
-    raise ValueError("axis must be 'x', 'y', or 'z'")
+def _run(jobs, resume, benchmark, label):
+    resume = RESUME if resume is None else resume
+    benchmark = BENCHMARK if benchmark is None else benchmark
+    if COMPILE:
+        return run_batched(it, jobs, BATCH_SIZE, resume=resume, benchmark=benchmark, label=label,
+                           on_image=rasters)
+    return run_jobs(it, jobs, resume=resume, benchmark=benchmark, label=label, on_image=rasters)
+
+def _ramps(keys, axis, start, end, step):
+    """Global ramps for 'keys' over the zones cut by these planes (None unless GLOBAL_RAMPS)."""
+    if not GLOBAL_RAMPS:
+        return None
+    ramps = axis_ramps(mesh, keys or list(axis_slices.QUANTITIES), axis,
+                       axis_slices.positions(start, end, step), RAMP_PERCENTILES, index=mesh_zones)
+    report_ramps(f"{axis.upper()} {start}..{end}", ramps)
+    return ramps
+
+def export_slices(key, axis="x", start=90, end=265, step=5,
+                  reuse_plot=None, benchmark=None, resume=None):
+    """
+    Exports one quantity over a range of axis-aligned slices.
+
+    With reuse_plot the plot and its zone item are built once and only the
+    cut origin changes between slices; otherwise a new plot is created for
+    every slice. With benchmark the wall time of each slice is printed.
+    With resume, slices already current in the manifest are skipped.
+    """
+    reuse_plot = REUSE_PLOT if reuse_plot is None else reuse_plot
+    jobs = axis_slices.plan(axis, start, end, step, keys=[key], single_pass=False,
+                            reuse_plot=reuse_plot, base_dir=base_dir, dpi=DPI,
+                            fmt=IMAGE_FORMAT, background=COMPRESS_IN_BACKGROUND, zones=zones,
+                            ramps=_ramps([key], axis, start, end, step))
+    mode = "reused plot" if reuse_plot else "plot per slice"
+    timings, _ = _run(jobs, resume, benchmark, f"{key} {axis.upper()} ({mode})")
+    return timings
+
+def export_all_quantities(axis="x", start=90, end=265, step=5,
+                          keys=None, benchmark=None, resume=None):
+    """
+    Exports every quantity in 'keys' (default: all) while visiting each
+    cut plane only once.
+
+    A single plot is built for the axis; for each plane the cut is moved once
+    and only the zone item's colouring is switched between exports. The key
+    order is reversed on alternate planes so the colouring left by one plane
+    is reused for the first export of the next. With resume, images already
+    current in the manifest are skipped.
+    """
+    jobs = axis_slices.plan(axis, start, end, step, keys=keys, single_pass=True,
+                            base_dir=base_dir, dpi=DPI,
+                            fmt=IMAGE_FORMAT, background=COMPRESS_IN_BACKGROUND, zones=zones,
+                            ramps=_ramps(keys, axis, start, end, step))
+    timings, _ = _run(jobs, resume, benchmark, f"all quantities {axis.upper()} (single pass)")
+    return timings
 
 # ----------------------------------------------------
 # Displacement Slices
 # ----------------------------------------------------
 def export_displacement_slices(axis="x", start=90, end=265, step=5):
-    axis = axis.lower()
-    for i in range(start, end + 1, step):
-        origin, normal, dip, dip_dir = _plane_params(axis, i)
-        filename = f"{axis}_slice_disp_{i}.bmp"
-        filepath = os.path.join(dirs[f"disp_{axis}"], filename)
-
-        it.command(f'''
-            plot create "Disp {axis.upper()}-Slice @ {i}"
-            plot clear
-            plot background 'white'
-            plot outline active on width 2 color 'black'
-
-            plot item create zone active on ...
-                contour displacement component magnitude log off ...
-                ramp rainbow minimum automatic maximum automatic interval automatic ...
-                polygons fill on outline active on width 1 ...
-                cut active on type plane ...
-                    surface on front off back off ...
-                    origin {origin} normal {normal}
-
-            plot view projection parallel
-            plot view reset
-            plot view dip {dip}
-            plot view dip-direction {dip_dir}
-            plot view roll 0
-
-            plot export bitmap filename="{filepath}" dpi=300
-        ''')
+    return export_slices("disp", axis, start, end, step)
 
 # ----------------------------------------------------
 # Max Principal Effective Stress
 # ----------------------------------------------------
 def export_max_principal_slices(axis="x", start=90, end=265, step=5):
-    axis = axis.lower()
-    for i in range(start, end + 1, step):
-        origin, normal, dip, dip_dir = _plane_params(axis, i)
-        filename = f"{axis}_slice_max_principal_{i}.bmp"
-        filepath = os.path.join(dirs[f"max_{axis}"], filename)
-
-        it.command(f'''
-            plot create "MaxEffStress_{axis.upper()}{i}"
-            plot clear
-            plot active on
-            plot target active on
-            plot background 'white'
-            plot outline active on width 2 color 'black'
-
-            plot item create zone active on ...
-                contour stress-effective quantity maximum log off ...
-                method average ...
-                ramp rainbow minimum automatic maximum automatic interval automatic ...
-                polygons fill on outline active on width 1 ...
-                cut active on type plane ...
-                    surface on front off back off ...
-                    origin {origin} normal {normal} ...
-                null-faces-only off ...
-                hide-null mechanical on thermal off fluid off ...
-                transparency 0
-
-            plot view projection parallel
-            plot view reset
-            plot view dip {dip}
-            plot view dip-direction {dip_dir}
-
-            plot export bitmap filename="{filepath}" dpi=300
-        ''')
+    return export_slices("max", axis, start, end, step)
 
 # ----------------------------------------------------
 # Min Principal Effective Stress
 # ----------------------------------------------------
 def export_min_principal_slices(axis="x", start=90, end=265, step=5):
-    axis = axis.lower()
-    for i in range(start, end + 1, step):
-        origin, normal, dip, dip_dir = _plane_params(axis, i)
-        filename = f"{axis}_slice_min_principal_{i}.bmp"
-        filepath = os.path.join(dirs[f"min_{axis}"], filename)
-
-        it.command(f'''
-            plot create "MinEffStress_{axis.upper()}{i}"
-            plot clear
-            plot active on
-            plot target active on
-            plot background 'white'
-            plot outline active on width 2 color 'black'
-
-            plot item create zone active on ...
-                contour stress-effective quantity minimum log off ...
-                method average ...
-                ramp rainbow minimum automatic maximum automatic interval automatic ...
-                polygons fill on outline active on width 1 ...
-                cut active on type plane ...
-                    surface on front off back off ...
-                    origin {origin} normal {normal} ...
-                null-faces-only off ...
-                hide-null mechanical on thermal off fluid off ...
-                transparency 0
-
-            plot view projection parallel
-            plot view reset
-            plot view dip {dip}
-            plot view dip-direction {dip_dir}
-
-            plot export bitmap filename="{filepath}" dpi=300
-        ''')
+    return export_slices("min", axis, start, end, step)
 
 # ----------------------------------------------------
 # Zone State
 # ----------------------------------------------------
 def export_zone_state_slices(axis="x", start=90, end=265, step=5):
-    axis = axis.lower()
-    for i in range(start, end + 1, step):
-        origin, normal, dip, dip_dir = _plane_params(axis, i)
-        filename = f"{axis}_slice_state_{i}.bmp"
-        filepath = os.path.join(dirs[f"state_{axis}"], filename)
-
-        it.command(f'''
-            plot create "ZoneState_{axis.upper()}{i}"
-            plot clear
-            plot background 'white'
-            plot outline active on width 2 color 'black'
-
-            plot item create zone active on ...
-                label State Average ...
-                polygons fill on outline active on width 1 ...
-                cut active on type plane ...
-                    surface on front off back off ...
-                    origin {origin} normal {normal}
-
-            plot view projection parallel
-            plot view reset
-            plot view dip {dip}
-            plot view dip-direction {dip_dir}
-            plot view roll 0
-
-            plot export bitmap filename="{filepath}" dpi=300
-        ''')
+    return export_slices("state", axis, start, end, step)
 
 # ----------------------------------------------------
 # σzz (Effective) Stress
@@ -191,53 +142,19 @@ def export_zz_stress_slices(axis="x", start=90, end=265, step=5):
     """
     Exports slices of effective vertical stress (sigma_zz).
     """
-    axis = axis.lower()
-    for i in range(start, end + 1, step):
-        origin, normal, dip, dip_dir = _plane_params(axis, i)
-        filename = f"{axis}_slice_zz_{i}.bmp"
-        filepath = os.path.join(dirs[f"zz_{axis}"], filename)
-
-        it.command(f'''
-            plot create "ZZStress_{axis.upper()}{i}"
-            plot clear
-            plot active on
-            plot target active on
-            plot background 'white'
-            plot outline active on width 2 color 'black'
-
-            plot item create zone active on ...
-                contour stress-effective quantity zz log off ...
-                method average ...
-                ramp rainbow minimum automatic maximum automatic interval automatic ...
-                polygons fill on outline active on width 1 ...
-                cut active on type plane ...
-                    surface on front off back off ...
-                    origin {origin} normal {normal} ...
-                null-faces-only off ...
-                hide-null mechanical on thermal off fluid off ...
-                transparency 0
-
-            plot view projection parallel
-            plot view reset
-            plot view dip {dip}
-            plot view dip-direction {dip_dir}
-
-            plot export bitmap filename="{filepath}" dpi=300
-        ''')
+    return export_slices("zz", axis, start, end, step)
 
 # -----------------
 # Run all exports
 # -----------------
+# Each plane is cut once and all five quantities are exported from it.
+# For several FLAC3D consoles in parallel use slicekit/scheduler.py instead.
+if SNAPSHOT:
+    export_snapshot(it, SNAPSHOT, float32=True)
+
 # X and Y (vertical slices)
-export_displacement_slices("x"); export_displacement_slices("y")
-export_max_principal_slices("x"); export_max_principal_slices("y")
-export_min_principal_slices("x"); export_min_principal_slices("y")
-export_zone_state_slices("x");    export_zone_state_slices("y")
-export_zz_stress_slices("x");     export_zz_stress_slices("y")
+export_all_quantities("x")
+export_all_quantities("y")
 
 # Z (horizontal slices)
-export_displacement_slices("z", start=980, end=1080, step=5)
-export_max_principal_slices("z",  start=980, end=1080, step=5)
-export_min_principal_slices("z",  start=980, end=1080, step=5)
-export_zone_state_slices("z",     start=980, end=1080, step=5)
-export_zz_stress_slices("z",      start=980, end=1080, step=5)
+export_all_quantities("z", start=980, end=1080, step=5)
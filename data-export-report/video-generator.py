@@ -3,11 +3,15 @@
 # ------------------------------------------------
 # Combines exported FLAC3D slice images into a single .mp4 video.
 # Run this AFTER your export scripts have generated all images.
+# Same as: python -m slicekit.video make IMAGE_FOLDER -o OUTPUT_VIDEO
 # ================================================================
 
-import cv2
 import os
-import natsort
+import sys
+
+# repository root, for the shared slicekit helpers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from slicekit.video import collect_frames, make_videos
 
 # ------------------------------
 # User configuration
@@ -16,41 +20,39 @@ IMAGE_FOLDER = "./exports-e/max_principal/zslice"  # folder with your BMPs/PNGs
 OUTPUT_VIDEO = "./exports-e/max_principal/zslice/video_slices.mp4"
 
 FPS = 5               # frames per second (adjust for speed)
-EXTENSION = ".bmp"    # change to ".png" if you export PNGs
+EXTENSIONS = (".bmp", ".png", ".webp")   # any format the exporters write
+PREVIEW_GIF = None    # e.g. IMAGE_FOLDER + "/preview.gif": small preview from the same decode
+PREVIEW_WIDTH = 480
+
+# Encoder: ffmpeg (H.264/H.265) when installed, otherwise OpenCV mp4v
+ENCODER = "auto"      # "auto", "ffmpeg" or "opencv"
+CODEC = "h264"        # "h264" or "h265" (ffmpeg only)
+CRF = 20              # ffmpeg quality: lower = better and larger (18-28 typical)
+PRESET = "medium"     # ffmpeg speed/size trade-off: "ultrafast" ... "veryslow"
+READ_THREADS = 4      # images decoded ahead of the encoder
+
+# Output size: None keeps the image size. Smaller targets are decoded
+# already reduced (1/2, 1/4, 1/8), which is much faster for large images.
+TARGET_WIDTH = None   # e.g. 1920; height follows the aspect ratio unless set
+TARGET_HEIGHT = None
+FIT = "pad"           # frames of another size: "pad" (white), "resize" or "skip"
 
 # ------------------------------
 # Collect and sort image files
 # ------------------------------
-images = [f for f in os.listdir(IMAGE_FOLDER) if f.lower().endswith(EXTENSION)]
-images = natsort.natsorted(images)  # natural sort: vert_slice_001, vert_slice_002, ...
+images = collect_frames([IMAGE_FOLDER], extensions=EXTENSIONS)  # natural sort: vert_slice_001, vert_slice_002, ...
 
 if not images:
-    raise FileNotFoundError(f"No {EXTENSION} files found in {IMAGE_FOLDER}")
-
-# Read first image to get frame size
-first_image_path = os.path.join(IMAGE_FOLDER, images[0])
-frame = cv2.imread(first_image_path)
-height, width, _ = frame.shape
+    raise FileNotFoundError(f"No {'/'.join(EXTENSIONS)} files found in {IMAGE_FOLDER}")
 
 # ------------------------------
-# Create video writer
-# ------------------------------
-fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # codec
-video_writer = cv2.VideoWriter(OUTPUT_VIDEO, fourcc, FPS, (width, height))
-
-# ------------------------------
-# Write frames
+# Decode (prefetched) once, encode every output
 # ------------------------------
+outputs = [{"output": OUTPUT_VIDEO, "width": TARGET_WIDTH, "height": TARGET_HEIGHT}]
+if PREVIEW_GIF:
+    outputs.append({"output": PREVIEW_GIF, "width": PREVIEW_WIDTH})
 print(f"Creating video from {len(images)} images...")
 
-for img_name in images:
-    img_path = os.path.join(IMAGE_FOLDER, img_name)
-    frame = cv2.imread(img_path)
-    if frame is None:
-        print(f"⚠️ Skipping unreadable image: {img_name}")
-        continue
-    video_writer.write(frame)
-    print(f"Added {img_name}")
-
-video_writer.release()
+make_videos(images, outputs, FPS, encoder=ENCODER, codec=CODEC, crf=CRF, preset=PRESET,
+            workers=READ_THREADS, fit=FIT)
 print(f"\n Video saved as: {OUTPUT_VIDEO}")
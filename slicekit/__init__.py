@@ -0,0 +1,7 @@
+# ====================================================================
+# slicekit
+# --------------------------------------------------------------------
+# Helpers shared by the FLAC3D slice export scripts in this repository.
+# The export scripts add the repository root to sys.path and import
+# from here; nothing in this package needs to be installed.
+# ====================================================================
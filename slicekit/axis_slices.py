@@ -0,0 +1,238 @@
+# ====================================================================
+# slicekit/axis_slices.py
+# --------------------------------------------------------------------
+# Slice plans for the axis-aligned exports in data-export-report:
+# displacement, max/min principal effective stress, zone state and
+# σzz on x, y and z planes, written under ./exports/<quantity>/<axis>slice.
+# ====================================================================
+
+import os
+
+import numpy as np
+
+from slicekit.commands import colorby_command, cut_command, export_command
+from slicekit.extent import report_skipped
+from slicekit.images import output_paths
+
+BASE_DIR = "./exports"
+DPI = 300
+
+RAMP_AUTO = ("automatic", "automatic", "automatic")   # minimum, maximum, interval
+
+# ----------------------------------------------------
+# Quantities: plot title, export folder, filename stem,
+# how the zone item is coloured and the contour ramp
+# (if any)
+# ----------------------------------------------------
+QUANTITIES = {
+    "disp": {
+        "title":  "Disp",
+        "folder": "displacements",
+        "stem":   "disp",
+        "colorby": "contour displacement component magnitude log off",
+        "ramp": RAMP_AUTO,
+    },
+    "max": {
+        "title":  "MaxEffStress",
+        "folder": "max_principal",
+        "stem":   "max_principal",
+        "colorby": '''contour stress-effective quantity maximum log off ...
+                method average''',
+        "ramp": RAMP_AUTO,
+    },
+    "min": {
+        "title":  "MinEffStress",
+        "folder": "min_principal",
+        "stem":   "min_principal",
+        "colorby": '''contour stress-effective quantity minimum log off ...
+                method average''',
+        "ramp": RAMP_AUTO,
+    },
+    "state": {
+        "title":  "ZoneState",
+        "folder": "zone_state",
+        "stem":   "state",
+        "colorby": "label State Average",
+    },
+    # σzz (effective) stress
+    "zz": {
+        "title":  "ZZStress",
+        "folder": "zz_stress",
+        "stem":   "zz",
+        "colorby": '''contour stress-effective quantity zz log off ...
+                method average''',
+        "ramp": RAMP_AUTO,
+    },
+}
+
+
+def slice_dirs(base_dir=BASE_DIR):
+    """Output folder for every quantity/axis pair, keyed like 'max_x'."""
+    return {
+        f"{key}_{axis}": os.path.join(base_dir, q["folder"], f"{axis}slice")
+        for key, q in QUANTITIES.items()
+        for axis in "xyz"
+    }
+
+
+def make_dirs(base_dir=BASE_DIR):
+    for p in slice_dirs(base_dir).values():
+        os.makedirs(p, exist_ok=True)
+
+
+# ----------------------------------------------------
+# Helper: plane parameters for a given axis and value
+# ----------------------------------------------------
+def plane_params(axis, i):
+    axis = axis.lower()
+    if axis == "x":
+        return f"({i},0,0)", "(1,0,0)", "90", "90"   # origin, normal, dip, dip_dir
+    if axis == "y":
+        return f"(0,{i},0)", "(0,1,0)", "90", "0"
+    if axis == "z":
+        # top-down view for horizontal slice
+        return f"(0,0,{i})", "(0,0,1)", "0", "0"
+    raise ValueError("axis must be 'x', 'y', or 'z'")
+
+
+def positions(start, end, step):
+    """Plane positions start..end (inclusive) every 'step'; whole numbers stay ints."""
+    n = int(np.floor((end - start) / step + 1e-9)) + 1
+    values = np.round(start + step * np.arange(n), 6)
+    return [int(v) if float(v).is_integer() else float(v) for v in values]
+
+
+def colorby(key, ramp=None):
+    """Colour-by clause for 'key'; 'ramp' overrides the quantity's contour ramp."""
+    q = QUANTITIES[key]
+    if "ramp" not in q:
+        return q["colorby"]
+    lo, hi, interval = ramp or q["ramp"]
+    return f'''{q["colorby"]} ...
+                ramp rainbow minimum {lo} maximum {hi} interval {interval}'''
+
+
+def slice_path(key, axis, i, base_dir=BASE_DIR, fmt="bmp", name_format=None):
+    """Image path; 'name_format' (e.g. ".1f") formats the position, plain otherwise."""
+    q = QUANTITIES[key]
+    position = format(i, name_format) if name_format else i
+    filename = f"{axis}_slice_{q['stem']}_{position}.{fmt}"
+    return os.path.join(base_dir, q["folder"], f"{axis}slice", filename)
+
+
+def create_command(name, key, origin, normal, dip, dip_dir, ramp=None, outline=True):
+    """Create a plot holding one zone item cut at the given plane ('outline': zone edges)."""
+    return f'''
+        plot create "{name}"
+        plot clear
+        plot active on
+        plot target active on
+        plot background 'white'
+        plot outline active on width 2 color 'black'
+
+        plot item create zone active on ...
+                {colorby(key, ramp)} ...
+                polygons fill on {"outline active on width 1" if outline else "outline active off"} ...
+                cut active on type plane ...
+                    surface on front off back off ...
+                    origin {origin} normal {normal} ...
+                null-faces-only off ...
+                hide-null mechanical on thermal off fluid off ...
+                transparency 0
+
+        plot view projection parallel
+        plot view reset
+        plot view dip {dip}
+        plot view dip-direction {dip_dir}
+        plot view roll 0
+    '''
+
+
+def slice_params(key, axis, i, dpi=DPI, ramp=None, outline=True):
+    """Everything the rendered image depends on, as recorded in the manifest."""
+    origin, normal, dip, dip_dir = plane_params(axis, i)
+    params = {
+        "quantity": key,
+        "axis": axis,
+        "position": i,
+        "origin": origin,
+        "normal": normal,
+        "view": [dip, dip_dir],
+        "colorby": QUANTITIES[key]["colorby"],
+        "ramp": (ramp or QUANTITIES[key].get("ramp")) if "ramp" in QUANTITIES[key] else None,
+        "dpi": dpi,
+    }
+    if not outline:
+        params["outline"] = False
+    return params
+
+
+def slice_job(key, axis, i, plot, base_dir=BASE_DIR, dpi=DPI, fmt="bmp", background=False,
+              ramp=None, outline=True, name_format=None):
+    """
+    One exported image; jobs sharing 'plot' reuse the same FLAC3D plot.
+    'ramp' (minimum, maximum, interval) overrides the quantity's ramp;
+    'outline' and 'name_format' as in create_command and slice_path.
+    """
+    origin, normal, dip, dip_dir = plane_params(axis, i)
+    path = slice_path(key, axis, i, base_dir, name_format=name_format)
+    output, raw = output_paths(os.path.splitext(path)[0], fmt, background)
+    position = format(i, name_format) if name_format else i
+    return {
+        "label": f"Exporting {QUANTITIES[key]['folder'].replace('_', ' ')} slice "
+                 f"at {axis} = {position} m",
+        "output": output,
+        "raw": raw,
+        "manifest": os.path.join(base_dir, "manifest.json"),
+        "params": slice_params(key, axis, i, dpi, ramp, outline),
+        "plot": plot,
+        "plane": f"{axis}={i}",
+        "quantity": key if ramp is None else f"{key}:{':'.join(map(str, ramp))}",
+        "create": create_command(plot, key, origin, normal, dip, dip_dir, ramp, outline),
+        "cut": cut_command(origin, normal),
+        "colorby": colorby_command(colorby(key, ramp)),
+        "export": export_command(raw or output, dpi),
+    }
+
+
+def plan(axis="x", start=90, end=265, step=5, keys=None, single_pass=True,
+         reuse_plot=True, base_dir=BASE_DIR, dpi=DPI, fmt="bmp", background=False,
+         ramps=None, zones=None):
+    """
+    Jobs exporting 'keys' (default: all quantities) on axis planes start..end.
+
+    With single_pass every plane is visited once and all quantities are
+    exported from it, reversing the key order on alternate planes so the
+    colouring left by one plane is reused for the first export of the next.
+    Otherwise each quantity sweeps the whole range in turn, on its own plot
+    (or a new plot per slice when reuse_plot is off). 'fmt' and 'background'
+    choose the image format as in images.output_paths(); 'ramps' maps
+    quantity keys to (minimum, maximum, interval) overriding their ramp.
+    Steps may be fractional (e.g. z every 0.5 m). With 'zones' (an
+    extent.ZoneIndex) planes that cut no zone are left out and logged.
+    """
+    axis = axis.lower()
+    keys = list(QUANTITIES) if keys is None else list(keys)
+    ramps = ramps or {}
+    planes = positions(start, end, step)
+    if zones is not None:
+        hit = zones.axis_hits(axis, planes)
+        report_skipped(f"{axis} slices", [p for p, h in zip(planes, hit) if not h])
+        planes = [p for p, h in zip(planes, hit) if h]
+
+    if single_pass:
+        jobs = []
+        for n, i in enumerate(planes):
+            for key in (keys if n % 2 == 0 else keys[::-1]):
+                jobs.append(slice_job(key, axis, i, f"Slices_{axis.upper()}",
+                                      base_dir, dpi, fmt, background, ramps.get(key)))
+        return jobs
+
+    jobs = []
+    for key in keys:
+        title = QUANTITIES[key]["title"]
+        for i in planes:
+            plot = f"{title}_{axis.upper()}" if reuse_plot else f"{title}_{axis.upper()}{i}"
+            jobs.append(slice_job(key, axis, i, plot, base_dir, dpi, fmt, background,
+                                  ramps.get(key)))
+    return jobs
@@ -0,0 +1,167 @@
+# ====================================================================
+# slicekit/batch.py
+# --------------------------------------------------------------------
+# Compiles a slice plan into FLAC3D data files so a whole sweep runs
+# through a few 'program call' commands instead of one it.command()
+# round trip per image.
+#
+# Inside FLAC3D, run_batched() is a drop-in for jobs.run_jobs(). From a
+# plain Python prompt the plan can be compiled to a single file to be
+# called by hand:
+#
+#   python -m slicekit.batch --out sweep.dat axis x:90:265:5
+#
+# or checked against the per-image path with the recording stub:
+#
+#   python -m slicekit.batch --check sweep --out-dir ... --origin ...
+# ====================================================================
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from slicekit.cli import add_plan_arguments, build_plan
+from slicekit.jobs import ImageFinisher, ManifestSet, job_commands, report_timings
+
+BATCH_DIR = os.path.join(".", "exports", ".batches")
+
+
+def compile_jobs(jobs, current=(None, None, None)):
+    """
+    Return the data-file text rendering 'jobs' from plot state 'current',
+    and the plot state afterwards.
+    """
+    lines = []
+    for job in jobs:
+        cmds, current = job_commands(job, current)
+        for cmd in cmds:
+            lines.extend(line.rstrip() for line in cmd.splitlines() if line.strip())
+    return "\n".join(lines) + "\n", current
+
+
+def run_batched(it, jobs, batch_size=100, resume=True, benchmark=False,
+                manifests=None, label="export", batch_dir=BATCH_DIR, on_image=None):
+    """
+    Render 'jobs' through generated data files of 'batch_size' images each,
+    one 'program call' per file. Images are recorded in the manifest (and
+    passed to 'on_image') after each batch returns.
+    Returns (per-batch wall times, skipped count).
+    """
+    manifests = manifests or ManifestSet(it)
+    if resume:
+        pending = [job for job in jobs
+                   if not manifests.get(job["manifest"]).is_current(job["output"], job["params"])]
+    else:
+        pending = list(jobs)
+    skipped = len(jobs) - len(pending)
+    if on_image is not None and skipped:
+        todo = set(id(job) for job in pending)
+        for job in jobs:
+            if id(job) not in todo:
+                on_image(job)
+
+    os.makedirs(batch_dir, exist_ok=True)
+    finisher = ImageFinisher(manifests, on_image)
+    timings = []
+    current = (None, None, None)
+    for b in range(0, len(pending), batch_size):
+        batch = pending[b:b + batch_size]
+        text, current = compile_jobs(batch, current)
+        dat = os.path.join(batch_dir, f"batch_{b // batch_size:04d}.dat")
+        with open(dat, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        print(f"[{b + len(batch)}/{len(pending)}] {label}: calling {dat}")
+        t0 = time.perf_counter()
+        it.command(f'program call "{dat}"')
+        timings.append(time.perf_counter() - t0)
+
+        for job in batch:
+            finisher.finish(job)
+        os.remove(dat)
+
+    finisher.close()
+    manifests.flush()
+    if skipped:
+        print(f"{label}: skipped {skipped} images already exported")
+    if benchmark:
+        report_timings(f"{label} (batches of {batch_size})", timings)
+    return timings, skipped
+
+
+# ------------------------------
+# Equivalence check
+# ------------------------------
+def _command_lines(commands):
+    return [line.strip() for cmd in commands for line in cmd.splitlines()
+            if line.strip() and not line.strip().startswith("program call")]
+
+
+def check_equivalence(jobs, batch_size=100):
+    """
+    Run 'jobs' per image and batched against the stub itasca module (in a
+    scratch folder) and compare the FLAC3D commands each path issues.
+    Returns True when they match line for line.
+    """
+    stub_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub")
+    sys.path.insert(0, stub_dir)
+    os.environ.setdefault("SLICEKIT_STUB_LATENCY", "0")
+    import itasca as stub
+    from slicekit.jobs import run_jobs
+
+    cwd = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="slicekit-check-")
+    try:
+        os.chdir(scratch)
+        for job in jobs:
+            os.makedirs(os.path.dirname(job["output"]) or ".", exist_ok=True)
+
+        del stub.commands[:]
+        run_jobs(stub, jobs, resume=False)
+        per_image = _command_lines(stub.commands)
+
+        del stub.commands[:]
+        run_batched(stub, jobs, batch_size=batch_size, resume=False)
+        batched = _command_lines(stub.commands)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+        sys.path.remove(stub_dir)
+
+    if per_image == batched:
+        print(f"OK: {len(jobs)} images, {len(per_image)} identical command lines")
+        return True
+    for n, (a, b) in enumerate(zip(per_image, batched)):
+        if a != b:
+            print(f"First difference at command line {n}:\n  per-image: {a}\n  batched:   {b}")
+            break
+    else:
+        print(f"Length differs: {len(per_image)} per-image vs {len(batched)} batched lines")
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a slice plan into FLAC3D data files.")
+    parser.add_argument("--out", default="sweep.dat", help="data file to write")
+    parser.add_argument("--check", action="store_true",
+                        help="compare batched and per-image commands using the stub itasca module")
+    parser.add_argument("--batch-size", type=int, default=100)
+    add_plan_arguments(parser)
+    args = parser.parse_args(argv)
+
+    jobs = build_plan(args, make_dirs=not args.check)
+    if args.check:
+        sys.exit(0 if check_equivalence(jobs, args.batch_size) else 1)
+
+    text, _ = compile_jobs(jobs)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"Wrote {len(jobs)} images to {os.path.abspath(args.out)}; "
+          f"run it in FLAC3D with: program call \"{args.out}\"")
+
+
+if __name__ == "__main__":
+    main()
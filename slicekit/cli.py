@@ -0,0 +1,89 @@
+# ====================================================================
+# slicekit/cli.py
+# --------------------------------------------------------------------
+# Command-line description of a slice plan, shared by the tools that
+# run outside FLAC3D (scheduler, batch compiler):
+#
+#   axis  x:90:265:5 y:90:265:5 z:980:1080:5 [--keys max min]
+#   sweep --out-dir DIR --origin X Y Z --normal NX NY NZ --count N ...
+#   spec  sweeps.toml
+# ====================================================================
+
+import os
+
+from slicekit import axis_slices, spec, sweep
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def _axis_range(text):
+    axis, start, end, step = text.split(":")
+    return axis.lower(), _number(start), _number(end), _number(step)
+
+
+def add_plan_arguments(parser):
+    """Add the 'axis' and 'sweep' plan subcommands to an argparse parser."""
+    parser.add_argument("--format", default="bmp", choices=["bmp", "png", "jpg", "webp"],
+                        help="image format of the exported slices")
+    parser.add_argument("--background", action="store_true",
+                        help="let FLAC3D write BMP and convert to --format on a background thread")
+    sub = parser.add_subparsers(dest="plan", required=True)
+
+    p_axis = sub.add_parser("axis", help="data-export-report axis slices")
+    p_axis.add_argument("ranges", nargs="*", type=_axis_range,
+                        default=[("x", 90, 265, 5), ("y", 90, 265, 5), ("z", 980, 1080, 5)],
+                        help="axis:start:end:step (default: the data-export-automated.py run)")
+    p_axis.add_argument("--keys", nargs="+", choices=list(axis_slices.QUANTITIES))
+
+    p_sweep = sub.add_parser("sweep", help="slab-review-code style vertical sweep")
+    p_sweep.add_argument("--out-dir", required=True)
+    p_sweep.add_argument("--origin", nargs=3, type=float, required=True)
+    p_sweep.add_argument("--normal", nargs=3, type=float, required=True)
+    p_sweep.add_argument("--spacing", type=float, default=0.5)
+    p_sweep.add_argument("--count", type=int, required=True)
+    p_sweep.add_argument("--reverse", action="store_true", help="step opposite the normal")
+    p_sweep.add_argument("--ramp", nargs=3, type=_number, default=(0, 100000, 50),
+                         metavar=("MIN", "MAX", "INTERVAL"))
+    p_sweep.add_argument("--center", nargs=3, type=float, required=True)
+    p_sweep.add_argument("--eye", nargs=3, type=float, required=True)
+    p_sweep.add_argument("--roll", type=float, default=0.0)
+    p_sweep.add_argument("--dpi", type=int, default=300)
+    p_sweep.add_argument("--name", default="VertSlice", help="plot name")
+
+    p_spec = sub.add_parser("spec", help="sweeps from a .toml/.yaml sweep spec "
+                                         "(its [run] table sets the image format)")
+    p_spec.add_argument("path")
+
+
+def needs_mesh(args):
+    """True if the plan resolves global ramps, which need the zone values (a ZoneMesh)."""
+    return args.plan == "spec" and bool(spec.global_sweeps(spec.sweeps(spec.load_spec(args.path))))
+
+
+def build_plan(args, make_dirs=True, mesh=None, zones=None):
+    """
+    Expand parsed plan arguments into a job list; 'mesh' (a
+    section.ZoneMesh) resolves global ramps in spec plans and with 'zones'
+    (an extent.ZoneIndex) planes cutting no zone are dropped.
+    """
+    if args.plan == "spec":
+        return spec.spec_jobs(args.path, make_dirs, mesh, zones)
+    if args.plan == "axis":
+        jobs = []
+        for axis, start, end, step in args.ranges:
+            jobs += axis_slices.plan(axis, start, end, step, keys=args.keys,
+                                     fmt=args.format, background=args.background,
+                                     zones=zones)
+        if make_dirs:
+            axis_slices.make_dirs()
+        return jobs
+    if make_dirs:
+        os.makedirs(args.out_dir, exist_ok=True)
+    return sweep.plan(args.out_dir, tuple(args.origin), tuple(args.normal), args.spacing,
+                      args.count, direction=-1 if args.reverse else 1, ramp=tuple(args.ramp),
+                      center=tuple(args.center), eye=tuple(args.eye), roll=args.roll,
+                      dpi=args.dpi, name=args.name, fmt=args.format, background=args.background,
+                      zones=zones)
@@ -0,0 +1,30 @@
+# ====================================================================
+# slicekit/commands.py
+# --------------------------------------------------------------------
+# Small FLAC3D command builders shared by the slice plans.
+# ====================================================================
+
+# Name FLAC3D gives the first zone item on a freshly cleared plot
+ZONE_ITEM = "Zone"
+
+
+def vec(v, fmt=""):
+    """Format a 3-vector as FLAC3D expects it, e.g. (1.000,2.000,3.000)."""
+    return "(" + ",".join(format(c, fmt) for c in v) + ")"
+
+
+def cut_command(origin, normal):
+    """Move the cut plane of the current plot's zone item."""
+    return f'plot item modify "{ZONE_ITEM}" cut origin {origin} normal {normal}'
+
+
+def colorby_command(colorby):
+    """Switch what the current plot's zone item is coloured by."""
+    return f'''
+        plot item modify "{ZONE_ITEM}" ...
+                {colorby}
+    '''
+
+
+def export_command(filepath, dpi):
+    return f'plot export bitmap filename="{filepath}" dpi={dpi}'
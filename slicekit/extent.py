@@ -0,0 +1,126 @@
+# ====================================================================
+# slicekit/extent.py
+# --------------------------------------------------------------------
+# Which cut planes actually pass through the model. The zones' bounding
+# boxes are read once (from the bulk gridpoint positions, null zones left
+# out) and indexed by sorting their extents along each plane normal in
+# use, so the number of zones a plane cuts is two binary searches.
+# Planes cutting no zone would only render blank images and are dropped
+# from the plan before anything is sent to FLAC3D.
+# ====================================================================
+
+import numpy as np
+
+AXES = {"x": 0, "y": 1, "z": 2}
+
+
+def zone_boxes(it, skip_null=True):
+    """
+    (lo, hi) arrays, (N, 3) each, bounding every zone's gridpoints, from
+    the same bulk read as the section engine (section.read_model).
+    Null zones are skipped with 'skip_null' (they are hidden in the plots).
+    """
+    from slicekit.section import read_model
+
+    m = read_model(it)
+    gps = m["zone_gridpoints"]
+    keep = gps[:, 0] >= 0
+    if skip_null:
+        keep &= ~m["zone_null"]
+    gps = gps[keep]
+    # -1 padding (zones with fewer than 8 gridpoints) repeats the first gridpoint
+    corners = m["gp_pos"][np.where(gps >= 0, gps, gps[:, :1])]
+    return corners.min(axis=1), corners.max(axis=1)
+
+
+class ZoneIndex:
+    """Zone extents sorted per plane normal, for counting the zones a plane cuts."""
+
+    def __init__(self, lo, hi):
+        lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+        self.center = (lo + hi) / 2
+        self.half = (hi - lo) / 2
+        self.bounds = tuple(lo.min(axis=0)) + tuple(hi.max(axis=0)) if len(lo) else None
+        self._sorted = {}
+
+    @classmethod
+    def from_model(cls, it, skip_null=True):
+        """Index of the loaded model's zones, or None (with a message) if it has none."""
+        return cls.from_boxes(*zone_boxes(it, skip_null))
+
+    @classmethod
+    def from_boxes(cls, lo, hi):
+        """Index of the zone boxes (lo, hi), e.g. a section.ZoneMesh's, or None if empty."""
+        if not len(lo):
+            print("No zones in the model; cut planes are not checked against it")
+            return None
+        index = cls(lo, hi)
+        b = index.bounds
+        print(f"Zone extents ({len(lo)} zones): x {b[0]:g}..{b[3]:g}, "
+              f"y {b[1]:g}..{b[4]:g}, z {b[2]:g}..{b[5]:g}")
+        return index
+
+    def __len__(self):
+        return len(self.center)
+
+    def _extents(self, normal):
+        key = tuple(np.round(normal, 9))
+        if key not in self._sorted:
+            c = self.center @ normal
+            r = self.half @ np.abs(normal)
+            self._sorted[key] = (np.sort(c - r), np.sort(c + r))
+        return self._sorted[key]
+
+    def cut_counts(self, origins, normals):
+        """Number of zones each plane (origin, normal rows) passes through."""
+        origins = np.atleast_2d(np.asarray(origins, dtype=float))
+        normals = np.broadcast_to(np.asarray(normals, dtype=float), origins.shape)
+        offsets = np.einsum("ij,ij->i", origins, normals)
+        unique, which = np.unique(np.round(normals, 9), axis=0, return_inverse=True)
+        counts = np.empty(len(origins), dtype=int)
+        for k, normal in enumerate(unique):
+            sel = which.ravel() == k
+            lo, hi = self._extents(normal)
+            d = offsets[sel]
+            # zones with lo <= d, minus those entirely below (hi < d)
+            counts[sel] = np.searchsorted(lo, d, side="right") - np.searchsorted(hi, d, side="left")
+        return counts
+
+    def cut_zones(self, origins, normals):
+        """Boolean mask of the zones (in index order) cut by at least one of the planes."""
+        origins = np.atleast_2d(np.asarray(origins, dtype=float))
+        normals = np.broadcast_to(np.asarray(normals, dtype=float), origins.shape)
+        offsets = np.einsum("ij,ij->i", origins, normals)
+        unique, which = np.unique(np.round(normals, 9), axis=0, return_inverse=True)
+        cut = np.zeros(len(self), dtype=bool)
+        for k, normal in enumerate(unique):
+            d = np.sort(offsets[which.ravel() == k])
+            c = self.center @ normal
+            r = self.half @ np.abs(normal)
+            # first plane at or above each zone's low extent, if still below its high one
+            first = np.searchsorted(d, c - r, side="left")
+            inside = first < len(d)
+            cut[inside] |= d[first[inside]] <= (c + r)[inside]
+        return cut
+
+    def hits(self, origins, normals):
+        """Boolean mask of the planes that cut at least one zone."""
+        return self.cut_counts(origins, normals) > 0
+
+    def axis_hits(self, axis, positions):
+        """Mask of the axis planes (e.g. x = positions) that cut at least one zone."""
+        pos = np.asarray(positions, dtype=float)
+        origins = np.zeros((len(pos), 3))
+        origins[:, AXES[axis.lower()]] = pos
+        normal = np.zeros(3)
+        normal[AXES[axis.lower()]] = 1.0
+        return self.hits(origins, normal)
+
+
+def report_skipped(label, skipped, limit=8):
+    """Log the planes dropped for missing every zone."""
+    if not len(skipped):
+        return
+    shown = ", ".join(str(s) for s in skipped[:limit])
+    more = f", ... ({len(skipped) - limit} more)" if len(skipped) > limit else ""
+    print(f"{label}: skipping {len(skipped)} planes outside the zones: {shown}{more}")
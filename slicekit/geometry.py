@@ -0,0 +1,108 @@
+# ====================================================================
+# slicekit/geometry.py
+# --------------------------------------------------------------------
+# Cut-plane geometry for sweeps. Every generator returns (origins,
+# normals) as (N, 3) float arrays, one row per slice, in render order:
+#
+#   linear         fixed normal, stepping along (or against) it
+#   bidirectional  fixed normal, stepping both ways from the base plane
+#   radial         normal rotating about an axis through the origin
+#   polyline       planes normal to a path (e.g. a tunnel alignment),
+#                  spaced along its length
+#
+# clip_to_box() drops the planes that miss a bounding box, so no
+# frames are spent on empty cuts.
+# ====================================================================
+
+import numpy as np
+
+
+def _unit(v):
+    v = np.asarray(v, dtype=float)
+    n = np.linalg.norm(v, axis=-1, keepdims=True)
+    if np.any(n == 0):
+        raise ValueError("zero-length direction vector")
+    return v / n
+
+
+def linear(origin, normal, spacing, count, direction=1):
+    """'count' planes from 'origin', 'spacing' apart along direction * normal."""
+    normal = np.asarray(normal, dtype=float)
+    steps = direction * spacing * np.arange(count)
+    origins = np.asarray(origin, dtype=float) + steps[:, None] * normal
+    return origins, np.broadcast_to(normal, origins.shape).copy()
+
+
+def bidirectional(origin, normal, spacing, back, forward):
+    """
+    Planes from 'back' steps behind 'origin' to 'forward' steps ahead of it
+    (the base plane included once), ordered along the normal.
+    """
+    normal = np.asarray(normal, dtype=float)
+    steps = spacing * np.arange(-back, forward + 1)
+    origins = np.asarray(origin, dtype=float) + steps[:, None] * normal
+    return origins, np.broadcast_to(normal, origins.shape).copy()
+
+
+def rotate(vector, axis, angles):
+    """'vector' rotated about 'axis' by each of 'angles' (radians), as (N, 3) (Rodrigues)."""
+    k = _unit(axis)
+    v = np.asarray(vector, dtype=float)
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    return v * cos + np.cross(k, v) * sin + k * (k @ v) * (1 - cos)
+
+
+def radial(origin, axis, normal, angle_step, count, start_angle=0.0):
+    """
+    'count' planes through 'origin' whose normal starts at 'normal' turned
+    by 'start_angle' and rotates 'angle_step' degrees per slice about 'axis'.
+    """
+    angles = np.radians(start_angle + angle_step * np.arange(count))
+    normals = rotate(normal, axis, angles)
+    return np.broadcast_to(np.asarray(origin, dtype=float), normals.shape).copy(), normals
+
+
+def polyline(points, spacing):
+    """
+    Planes every 'spacing' along the path through 'points' (first point
+    included), each normal to the path segment it lies on.
+    """
+    pts = np.asarray(points, dtype=float)
+    if len(pts) < 2:
+        raise ValueError("a polyline needs at least two points")
+    seg = np.diff(pts, axis=0)
+    length = np.linalg.norm(seg, axis=1)
+    keep = length > 0
+    pts = np.vstack([pts[:1], pts[1:][keep]])
+    seg, length = seg[keep], length[keep]
+    cum = np.concatenate([[0.0], np.cumsum(length)])
+
+    s = spacing * np.arange(int(np.floor(cum[-1] / spacing + 1e-9)) + 1)
+    i = np.clip(np.searchsorted(cum, s, side="right") - 1, 0, len(seg) - 1)
+    t = (s - cum[i]) / length[i]
+    origins = pts[i] + t[:, None] * seg[i]
+    return origins, seg[i] / length[i][:, None]
+
+
+# ------------------------------
+# Clipping
+# ------------------------------
+def box_corners(bounds):
+    """The 8 corners of bounds (xmin, ymin, zmin, xmax, ymax, zmax)."""
+    lo, hi = np.asarray(bounds[:3], float), np.asarray(bounds[3:], float)
+    pick = np.array([[(c >> a) & 1 for a in range(3)] for c in range(8)], dtype=bool)
+    return np.where(pick, hi, lo)
+
+
+def planes_hit_box(origins, normals, bounds):
+    """Boolean mask: True for planes that cut the box (touching counts)."""
+    corners = box_corners(bounds)
+    # signed distance of every corner to every plane, (N, 8)
+    d = normals @ corners.T - np.einsum("ij,ij->i", normals, origins)[:, None]
+    return (d.min(axis=1) <= 0) & (d.max(axis=1) >= 0)
+
+
+def clip_to_box(origins, normals, bounds):
+    """(origins, normals, kept) for the planes cutting 'bounds'; kept indexes the input."""
+    mask = planes_hit_box(origins, normals, bounds)
+    return origins[mask], normals[mask], np.flatnonzero(mask)
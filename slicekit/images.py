@@ -0,0 +1,176 @@
+# ====================================================================
+# slicekit/images.py
+# --------------------------------------------------------------------
+# Output image formats for slice exports. FLAC3D writes BMP, PNG and
+# JPEG itself, picked from the filename extension. Other formats
+# (lossless WebP), or compressing in the background so FLAC3D only pays
+# for the fast BMP write, go through BackgroundCompressor: FLAC3D
+# exports a temporary BMP and a Pillow thread converts it while the
+# next slice renders.
+#
+# The same conversion can run as a separate process over export folders,
+# e.g. for data files compiled offline, optionally watching for new BMPs:
+#
+#   python -m slicekit.images --to webp --watch ./exports
+# ====================================================================
+
+import argparse
+import os
+import queue
+import threading
+import time
+
+NATIVE_FORMATS = ("bmp", "png", "jpg")
+IMAGE_EXTENSIONS = (".bmp", ".png", ".webp", ".jpg", ".jpeg")
+
+
+def output_paths(path, fmt="bmp", background=False):
+    """
+    Return (output, raw) for an image whose path without extension is
+    'path'. 'raw' is the BMP FLAC3D writes when the output needs
+    converting afterwards, otherwise None.
+    """
+    fmt = fmt.lower().lstrip(".")
+    output = f"{path}.{fmt}"
+    if fmt == "bmp" or (fmt in NATIVE_FORMATS and not background):
+        return output, None
+    return output, f"{path}.bmp"
+
+
+def convert_image(src, dst, delete_source=True):
+    """Re-encode 'src' losslessly into the format given by the extension of 'dst'."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Pillow is required to convert exported images "
+                          "(pip install pillow in the FLAC3D Python)")
+    ext = os.path.splitext(dst)[1].lower()
+    with Image.open(src) as img:
+        img = img.convert("RGB")
+        tmp = dst + ".part"
+        if ext == ".webp":
+            img.save(tmp, format="WEBP", lossless=True, method=4)
+        elif ext == ".png":
+            img.save(tmp, format="PNG", compress_level=6)
+        elif ext in (".jpg", ".jpeg"):
+            img.save(tmp, format="JPEG", quality=95)
+        else:
+            raise ValueError(f"Unsupported output format: {dst}")
+    os.replace(tmp, dst)
+    if delete_source:
+        os.remove(src)
+
+
+class BackgroundCompressor:
+    """
+    Converts exported BMPs on a worker thread.
+
+    submit() queues a conversion and returns immediately; drain() returns
+    (tag, error) for conversions finished since the last call (error None
+    when the image was written), and close()
+    waits for the rest. The queue is bounded so a slow disk throttles the
+    export loop instead of piling up BMPs.
+    """
+
+    def __init__(self, max_pending=8, delete_source=True):
+        self.delete_source = delete_source
+        self._todo = queue.Queue(maxsize=max_pending)
+        self._done = queue.Queue()
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        while True:
+            item = self._todo.get()
+            if item is None:
+                return
+            src, dst, tag = item
+            try:
+                convert_image(src, dst, self.delete_source)
+                self._done.put((tag, None))
+            except Exception as e:   # report, keep converting the rest
+                self._done.put((tag, e))
+
+    def submit(self, src, dst, tag=None):
+        self._todo.put((src, dst, tag))
+
+    def drain(self):
+        """(tag, error) of the conversions finished so far; failures are logged."""
+        done = []
+        while True:
+            try:
+                tag, error = self._done.get_nowait()
+            except queue.Empty:
+                return done
+            if error is not None:
+                print(f"Image conversion failed: {error}")
+            done.append((tag, error))
+
+    def close(self):
+        """Wait for all queued conversions; return those not yet drained, as drain()."""
+        self._todo.put(None)
+        self._thread.join()
+        return self.drain()
+
+
+# ------------------------------
+# Folder post-processor
+# ------------------------------
+def _bmps(folders):
+    for folder in folders:
+        for root, _, files in os.walk(folder):
+            for f in files:
+                if f.lower().endswith(".bmp"):
+                    yield os.path.join(root, f)
+
+
+def compress_folders(folders, fmt, keep=False, watch=False, poll=2.0):
+    """
+    Convert every BMP under 'folders' to 'fmt'. With 'watch', keep polling
+    for new BMPs until interrupted; a file is only converted once its size
+    has stopped changing between two polls, so half-written exports are
+    left alone.
+    """
+    seen = {}
+    converted = 0
+    try:
+        while True:
+            for src in _bmps(folders):
+                try:
+                    size = os.path.getsize(src)
+                except OSError:
+                    continue
+                if watch and seen.get(src) != size:
+                    seen[src] = size
+                    continue
+                dst = os.path.splitext(src)[0] + "." + fmt
+                try:
+                    convert_image(src, dst, delete_source=not keep)
+                    converted += 1
+                    print(f"{src} -> {dst}")
+                except Exception as e:
+                    print(f"Skipping {src}: {e}")
+                seen.pop(src, None)
+            if not watch:
+                break
+            time.sleep(poll)
+    except KeyboardInterrupt:
+        pass
+    print(f"Converted {converted} images")
+    return converted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compress exported BMP slices.")
+    parser.add_argument("folders", nargs="+")
+    parser.add_argument("--to", default="png", choices=["png", "webp", "jpg"])
+    parser.add_argument("--keep", action="store_true", help="keep the source BMPs")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep converting new BMPs as they land (Ctrl+C to stop)")
+    parser.add_argument("--poll", type=float, default=2.0, help="seconds between scans")
+    args = parser.parse_args(argv)
+    compress_folders(args.folders, args.to, keep=args.keep, watch=args.watch, poll=args.poll)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# ====================================================================
+# slicekit/jobs.py
+# --------------------------------------------------------------------
+# Executes a slice plan inside FLAC3D. A plan is a list of job dicts,
+# one per exported image:
+#
+#   output    image path written by the job
+#   raw       BMP that FLAC3D writes and that is converted into 'output'
+#             in the background (None when FLAC3D writes 'output' itself)
+#   manifest  manifest file the image is recorded in
+#   params    render parameters recorded in the manifest
+#   plot      plot name; consecutive jobs on the same plot reuse it
+#   plane     cut plane identity; the cut is only moved when it changes
+#   quantity  colouring identity; only switched when it changes
+#   create    commands creating the plot and item at this job's plane
+#   cut       command moving the cut to this job's plane
+#   colorby   command switching the item to this job's colouring
+#   export    command writing the image
+#   label     optional progress message
+#
+# Jobs are plain JSON-serialisable dicts so plans can be handed to
+# worker processes or compiled into command files.
+# ====================================================================
+
+import time
+
+from slicekit.images import BackgroundCompressor
+from slicekit.manifest import ExportManifest, model_state_hash
+
+
+class ManifestSet:
+    """One ExportManifest per manifest path, sharing a single model state hash."""
+
+    def __init__(self, it, suffix_for=None):
+        self.state_hash = model_state_hash(it)
+        self.suffix_for = suffix_for
+        self.manifests = {}
+
+    def get(self, path):
+        if path not in self.manifests:
+            if self.suffix_for is None:
+                self.manifests[path] = ExportManifest(path, self.state_hash)
+            else:
+                base = ExportManifest(path, self.state_hash)
+                self.manifests[path] = ExportManifest(self.suffix_for(path), self.state_hash,
+                                                      base=base)
+        return self.manifests[path]
+
+    def flush(self):
+        for m in self.manifests.values():
+            m.flush()
+
+
+class ImageFinisher:
+    """
+    Records exported images in their manifests. Jobs with a 'raw' BMP are
+    first handed to a BackgroundCompressor and recorded once converted.
+    'on_image' is called with each job once its image is final; when the
+    conversion failed it gets a copy of the job with 'failed' set to the
+    error, so consumers waiting on plan order (VideoStream) can move on.
+    """
+
+    def __init__(self, manifests, on_image=None):
+        self.manifests = manifests
+        self.on_image = on_image
+        self.compressor = None
+
+    def _record(self, job):
+        self.manifests.get(job["manifest"]).record(job["output"], job["params"])
+        if self.on_image is not None:
+            self.on_image(job)
+
+    def _converted(self, done):
+        for job, error in done:
+            if error is None:
+                self._record(job)
+            elif self.on_image is not None:
+                self.on_image(dict(job, failed=str(error)))
+
+    def finish(self, job):
+        if not job.get("raw"):
+            self._record(job)
+            return
+        if self.compressor is None:
+            self.compressor = BackgroundCompressor()
+        self.compressor.submit(job["raw"], job["output"], job)
+        self._converted(self.compressor.drain())
+
+    def close(self):
+        if self.compressor is not None:
+            self._converted(self.compressor.close())
+            self.compressor = None
+
+
+def job_commands(job, current):
+    """
+    Commands needed to render 'job' given the plot state 'current'
+    (plot, plane, quantity), and the state afterwards.
+    """
+    plot, plane, quantity = current
+    if job["plot"] != plot:
+        cmds = [job["create"]]
+    else:
+        cmds = []
+        if job["plane"] != plane:
+            cmds.append(job["cut"])
+        if job["quantity"] != quantity:
+            cmds.append(job["colorby"])
+    cmds.append(job["export"])
+    return cmds, (job["plot"], job["plane"], job["quantity"])
+
+
+def report_timings(label, timings):
+    if not timings:
+        return
+    ordered = sorted(timings)
+    total = sum(timings)
+    print(f"[benchmark] {label}: {len(timings)} images in {total:.2f} s | "
+          f"first {timings[0]:.3f} s, mean {total / len(timings):.3f} s, "
+          f"median {ordered[len(ordered) // 2]:.3f} s, max {ordered[-1]:.3f} s")
+
+
+def image_hooks(*hooks):
+    """A single on_image callback calling each of 'hooks' (None entries skipped) in turn."""
+    hooks = [h for h in hooks if h is not None]
+    if len(hooks) < 2:
+        return hooks[0] if hooks else None
+
+    def on_image(job):
+        for hook in hooks:
+            hook(job)
+    return on_image
+
+
+def run_jobs(it, jobs, resume=True, benchmark=False, manifests=None, label="export",
+             on_image=None):
+    """
+    Render 'jobs' in order, skipping those already current in their manifest
+    when 'resume' is set. 'on_image' (e.g. a slicekit.stream.VideoStream) is
+    called with every job whose image is ready, rendered or skipped, and
+    with a copy marked 'failed' for those whose conversion failed.
+    Returns (per-image wall times, skipped count).
+    """
+    manifests = manifests or ManifestSet(it)
+    finisher = ImageFinisher(manifests, on_image)
+    timings = []
+    skipped = 0
+    current = (None, None, None)
+
+    for n, job in enumerate(jobs, start=1):
+        manifest = manifests.get(job["manifest"])
+        if resume and manifest.is_current(job["output"], job["params"]):
+            skipped += 1
+            if on_image is not None:
+                on_image(job)
+            continue
+        if job.get("label"):
+            print(f"[{n}/{len(jobs)}] {job['label']}")
+
+        t0 = time.perf_counter()
+        cmds, current = job_commands(job, current)
+        for cmd in cmds:
+            it.command(cmd)
+        finisher.finish(job)
+
+        if benchmark:
+            timings.append(time.perf_counter() - t0)
+            print(f"[benchmark] {job['output']}: {timings[-1]:.3f} s")
+
+    finisher.close()
+    manifests.flush()
+    if skipped:
+        print(f"{label}: skipped {skipped} images already exported")
+    if benchmark:
+        report_timings(label, timings)
+    return timings, skipped
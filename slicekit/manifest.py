@@ -0,0 +1,146 @@
+# ====================================================================
+# slicekit/manifest.py
+# --------------------------------------------------------------------
+# JSON job manifest for slice exports. Every exported image is recorded
+# with the parameters it was rendered from and the model state it came
+# from, so a restarted export only renders missing or stale frames.
+# ====================================================================
+
+import glob
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def model_state_hash(it):
+    """
+    Return a short hash identifying the currently loaded FLAC3D model state.
+
+    Built from the zone/gridpoint counts and the gridpoint displacement
+    field, so it changes whenever the model is re-cycled or a different
+    state is restored.
+    """
+    h = hashlib.sha1()
+    h.update(f"{it.zone.count()}|{it.gridpoint.count()}".encode())
+    try:
+        import numpy as np
+        h.update(np.ascontiguousarray(it.gridpointarray.disp()).tobytes())
+    except (ImportError, AttributeError):
+        # older consoles without the array interface: fall back to a walk
+        for gp in it.gridpoint.list():
+            h.update(repr(tuple(gp.disp())).encode())
+    return h.hexdigest()[:16]
+
+
+class ExportManifest:
+    """
+    Record of exported images keyed by output path.
+
+    Each entry holds the render parameters, the model state hash and the
+    size/mtime of the file written, and is considered current only while
+    all of those still match. The file is rewritten every 'save_every'
+    records (a crash loses at most that many entries, which are simply
+    re-rendered) and on flush(). An optional read-only 'base' manifest is
+    also consulted by is_current(); parallel workers use it to see the
+    shared manifest while recording into their own partial file.
+    """
+
+    def __init__(self, path, state_hash=None, save_every=25, base=None):
+        self.path = path
+        self.state_hash = state_hash
+        self.save_every = save_every
+        self.base = base
+        self.entries = {}
+        self._unsaved = 0
+        if os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError):
+                print(f"Ignoring unreadable manifest: {path}")
+
+    @staticmethod
+    def _key(output):
+        return os.path.normcase(os.path.abspath(output))
+
+    def is_current(self, output, params):
+        """True if 'output' exists and was rendered from 'params' and this model state."""
+        entry = self.entries.get(self._key(output))
+        if entry is None:
+            return self.base is not None and self.base.is_current(output, params)
+        if entry.get("params") != _jsonable(params) or entry.get("state") != self.state_hash:
+            return False
+        try:
+            st = os.stat(output)
+        except OSError:
+            return False
+        return st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def record(self, output, params):
+        """Record a freshly written 'output' rendered from 'params'."""
+        try:
+            st = os.stat(output)
+        except OSError:
+            print(f"Export did not produce {output}; not recorded in manifest")
+            return
+        self.entries[self._key(output)] = {
+            "output": output,
+            "params": _jsonable(params),
+            "state": self.state_hash,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def flush(self):
+        """Save if anything was recorded since the last save."""
+        if self._unsaved:
+            self.save()
+
+    def save(self):
+        """Write the manifest atomically so a crash never leaves it half-written."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(tmp, self.path)
+        self._unsaved = 0
+
+
+def _jsonable(params):
+    # round-trip through JSON so tuples compare equal to the lists read back
+    return json.loads(json.dumps(params))
+
+
+def partial_path(path, worker):
+    """Manifest file a parallel worker records into instead of 'path'."""
+    return f"{path}.w{worker}"
+
+
+def merge_partials(path):
+    """
+    Fold any worker partial manifests next to 'path' into it and delete them.
+
+    Returns the number of entries merged. Safe to call when there are none,
+    e.g. to pick up partials left behind by a crashed parallel run.
+    """
+    partials = sorted(p for p in glob.glob(glob.escape(path) + ".w*")
+                      if not p.endswith(".tmp"))
+    if not partials:
+        return 0
+    main = ExportManifest(path)
+    merged = 0
+    for p in partials:
+        part = ExportManifest(p)
+        main.entries.update(part.entries)
+        merged += len(part.entries)
+    main.save()
+    for p in partials:
+        os.remove(p)
+    return merged
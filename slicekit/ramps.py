@@ -0,0 +1,102 @@
+# ====================================================================
+# slicekit/ramps.py
+# --------------------------------------------------------------------
+# Global contour ramps. Instead of FLAC3D's per-slice "automatic" ramp
+# (every slice on its own scale) or bounds found by trial renders, the
+# ramp of each quantity is computed once from the zone values: one
+# vectorized read of the model (section.ZoneMesh), the zones cut by a
+# sweep's planes selected through their extents (extent.ZoneIndex),
+# and a min/max or percentile reduction. Bounds are rounded outwards to
+# a whole number of 1/2/5 x 10^k intervals:
+#
+#   mesh = ZoneMesh.from_model(it)
+#   ramps = axis_ramps(mesh, ["max", "zz"], "z", positions, percentiles=(1, 99))
+#   axis_slices.plan("z", ..., ramps=ramps)
+#
+# In spec files a sweep takes them with ramp = "global" (optionally
+# ramp_percentiles = [1, 99] and ramp_bands = 10), see slicekit.spec.
+# ====================================================================
+
+import numpy as np
+
+from slicekit.axis_slices import QUANTITIES
+from slicekit.extent import AXES, ZoneIndex
+
+DEFAULT_BANDS = 10       # contour bands across a global ramp
+
+
+def nice_interval(span, bands=DEFAULT_BANDS):
+    """Contour interval close to span / bands, rounded up to 1, 2 or 5 x 10^k."""
+    raw = abs(span) / max(int(bands), 1)
+    if raw <= 0 or not np.isfinite(raw):
+        return 1.0
+    exp = np.floor(np.log10(raw))
+    for m in (1, 2, 5, 10):
+        if m * 10 ** exp >= raw * (1 - 1e-9):
+            return float(m * 10 ** exp)
+
+
+def ramp_bounds(values, percentiles=None, bands=DEFAULT_BANDS):
+    """
+    (minimum, maximum, interval) covering 'values', or only the
+    'percentiles' (low, high) range of them, widened to whole intervals.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if not values.size:
+        return None
+    if percentiles:
+        lo, hi = np.percentile(values, percentiles)
+    else:
+        lo, hi = values.min(), values.max()
+    if hi == lo:
+        hi = lo + (abs(lo) or 1.0)
+    interval = nice_interval(hi - lo, bands)
+    lo = np.floor(lo / interval + 1e-9) * interval
+    hi = np.ceil(hi / interval - 1e-9) * interval
+    return tuple(_tidy(v) for v in (lo, hi, interval))
+
+
+def _tidy(x):
+    x = float(np.round(x, 9))
+    return int(x) if x.is_integer() else x
+
+
+def global_ramps(mesh, keys, origins=None, normals=None, percentiles=None,
+                 bands=DEFAULT_BANDS, index=None):
+    """
+    {key: (minimum, maximum, interval)} for the contoured 'keys' ('state'
+    has no ramp) over the zones of 'mesh' cut by the planes (origins,
+    normals), or over all zones without planes. 'index' is a ZoneIndex of
+    the mesh's zone boxes, reused across calls.
+    """
+    if origins is not None and len(origins):
+        index = index or ZoneIndex(mesh.lo, mesh.hi)
+        cut = index.cut_zones(origins, normals)
+    else:
+        cut = slice(None)
+    ramps = {}
+    for key in keys:
+        if "ramp" not in QUANTITIES.get(key, {}) or key not in mesh.zone_values:
+            continue
+        ramp = ramp_bounds(mesh.zone_values[key][cut], percentiles, bands)
+        if ramp is not None:
+            ramps[key] = ramp
+    return ramps
+
+
+def axis_ramps(mesh, keys, axis, positions, percentiles=None, bands=DEFAULT_BANDS,
+               index=None):
+    """global_ramps for the axis planes axis = positions (e.g. z = 980..1080)."""
+    pos = np.asarray(positions, dtype=float)
+    origins = np.zeros((len(pos), 3))
+    origins[:, AXES[axis.lower()]] = pos
+    normal = np.zeros(3)
+    normal[AXES[axis.lower()]] = 1.0
+    return global_ramps(mesh, keys, origins, normal, percentiles, bands, index)
+
+
+def report_ramps(label, ramps):
+    """Log the ramps chosen for a sweep."""
+    for key, (lo, hi, interval) in ramps.items():
+        print(f"{label}: {key} ramp {lo:g}..{hi:g} every {interval:g}")
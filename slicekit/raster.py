@@ -0,0 +1,177 @@
+# ====================================================================
+# slicekit/raster.py
+# --------------------------------------------------------------------
+# Scalar rasters: each slice image can keep a float32 raster of the
+# sliced quantity next to it (<image stem>.raster.npz), holding
+#
+#   values   (height, width) float32 zone value per pixel (0 outside)
+#   mask     (height, width) bool, False outside the cut / in null zones
+#   meta     JSON: quantity, ramp, plane, screen axes and pixel framing
+#
+# so a new contour ramp is a NumPy lookup-table pass instead of a new
+# FLAC3D sweep. Rasters come from the section engine (slicekit.section)
+# with the offline renderer's framing, whether written by the FLAC3D
+# exporter (RasterWriter as run_jobs' on_image, spec option
+# 'rasters = true') or by slicekit.render --rasters.
+#
+# Re-colouring a folder with another ramp, banding or a log scale:
+#
+#   python -m slicekit.raster ./exports/max_principal/vertical_2 \
+#       --out-dir ./recoloured/350k --min 0 --max 350000 --interval 50000
+#   python -m slicekit.raster "./exports/**/zslice" --recursive \
+#       --out-dir ./recoloured/log --min=-1e3 --max=-2e6 --log
+# ====================================================================
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from slicekit.render import (SIZE, frame_transform, job_view, paint, rasterise,
+                             save_image)
+
+RASTER_SUFFIX = ".raster.npz"
+
+
+def raster_path(image):
+    """Raster file kept next to 'image'."""
+    return os.path.splitext(image)[0] + RASTER_SUFFIX
+
+
+# ------------------------------
+# Storage
+# ------------------------------
+def save_raster(path, values, mask, meta):
+    """Write a raster atomically (compressed .npz)."""
+    tmp = path + ".part"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, values=np.asarray(values, dtype=np.float32),
+                            mask=np.asarray(mask, dtype=bool),
+                            meta=np.array(json.dumps(meta)))
+    os.replace(tmp, path)
+
+
+def load_meta(path):
+    """Only the metadata of a raster (the arrays are not decompressed)."""
+    with np.load(path) as data:
+        return json.loads(str(data["meta"]))
+
+
+def load_raster(path):
+    """(values, mask, meta) of a raster file."""
+    with np.load(path) as data:
+        return data["values"], data["mask"], json.loads(str(data["meta"]))
+
+
+def slice_raster(mesh, params, size=SIZE, state_hash=None):
+    """(values, mask, meta) for a job's manifest params, sectioned from 'mesh'."""
+    origin, normal, right, up, quantity, ramp = job_view(params)
+    bounds = (mesh.lo.min(axis=0), mesh.hi.max(axis=0))
+    values, mask = rasterise(mesh.section(origin, normal, quantity), right, up, bounds, size)
+    scale, ox, oy = frame_transform(right, up, bounds, size)
+    meta = {
+        "quantity": quantity,
+        "ramp": list(ramp) if ramp is not None else None,
+        "origin": origin.tolist(), "normal": normal.tolist(),
+        "right": right.tolist(), "up": up.tolist(),
+        "scale": scale, "offset": [ox, oy],
+        "state": state_hash,
+    }
+    return values, mask, meta
+
+
+class RasterWriter:
+    """
+    Writes the raster of every finished job next to its image; pass as
+    on_image to run_jobs / run_batched. The zone mesh is read from the
+    model once (or 'mesh' is reused). Rasters already written for the same
+    model state are kept, and jobs whose image failed are passed over.
+    """
+
+    def __init__(self, it, size=SIZE, mesh=None):
+        from slicekit.manifest import model_state_hash
+        from slicekit.section import ZoneMesh
+
+        self.mesh = mesh if mesh is not None else ZoneMesh.from_model(it)
+        self.state_hash = model_state_hash(it)
+        self.size = tuple(size)
+        self.written = 0
+
+    def __call__(self, job):
+        if job.get("failed"):
+            return
+        path = raster_path(job["output"])
+        if os.path.exists(path):
+            try:
+                if load_meta(path).get("state") == self.state_hash:
+                    return
+            except (OSError, ValueError, KeyError):
+                pass
+        values, mask, meta = slice_raster(self.mesh, job["params"], self.size, self.state_hash)
+        save_raster(path, values, mask, meta)
+        self.written += 1
+
+
+# ------------------------------
+# Re-colouring
+# ------------------------------
+def recolour(path, output, ramp=None, log=False):
+    """
+    Colour the raster 'path' into the image 'output'. 'ramp' (minimum,
+    maximum, interval) defaults to the raster's own; "automatic" entries
+    use its value range.
+    """
+    values, mask, meta = load_raster(path)
+    img = paint(values, mask, ramp or meta["ramp"], meta["quantity"], log)
+    save_image(img, output)
+
+
+def recolour_all(paths, out_dir, ramp=None, log=False, fmt="png"):
+    """Re-colour 'paths' into 'out_dir', keeping their names. Returns wall seconds."""
+    os.makedirs(out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    for n, path in enumerate(paths, start=1):
+        name = os.path.basename(path)[:-len(RASTER_SUFFIX)] + "." + fmt
+        recolour(path, os.path.join(out_dir, name), ramp, log)
+        print(f"[{n}/{len(paths)}] {name}")
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    from slicekit.video import collect_frames
+
+    ap = argparse.ArgumentParser(description="Re-colour slice rasters with another ramp.")
+    ap.add_argument("inputs", nargs="+", help="folders or glob patterns with *.raster.npz")
+    ap.add_argument("--out-dir", required=True, help="folder for the re-coloured images")
+    ap.add_argument("--recursive", action="store_true", help="search folders recursively")
+    ap.add_argument("--min", type=float,
+                    help="ramp minimum, --min=-1e6 when negative (default: the raster's ramp)")
+    ap.add_argument("--max", type=float, help="ramp maximum")
+    ap.add_argument("--interval", type=float, help="band width (decades with --log)")
+    ap.add_argument("--auto", action="store_true", help="ramp on each slice's value range")
+    ap.add_argument("--log", action="store_true", help="log scale on value magnitudes")
+    ap.add_argument("--format", default="png", choices=["png", "webp", "bmp", "jpg"])
+    args = ap.parse_args(argv)
+
+    ramp = None
+    if args.auto:
+        ramp = ("automatic", "automatic", None)
+    elif args.min is not None or args.max is not None:
+        if args.min is None or args.max is None:
+            ap.error("--min and --max go together")
+        ramp = (args.min, args.max, args.interval)
+        if args.log and args.min * args.max <= 0:
+            ap.error("--log needs --min and --max of one sign")
+
+    paths = collect_frames(args.inputs, args.recursive, extensions=(RASTER_SUFFIX,))
+    if not paths:
+        raise SystemExit("No rasters found")
+    wall = recolour_all(paths, args.out_dir, ramp, args.log, args.format)
+    print(f"Re-coloured {len(paths)} slices in {wall:.2f} s "
+          f"({1000 * wall / len(paths):.0f} ms per slice)")
+
+
+if __name__ == "__main__":
+    main()
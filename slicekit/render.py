@@ -0,0 +1,333 @@
+# ====================================================================
+# slicekit/render.py
+# --------------------------------------------------------------------
+# Offline slice renderer: draws the planned slices from a model
+# snapshot (slicekit.snapshot) instead of a FLAC3D plot, on a process
+# pool, so a sweep needs no FLAC3D seat once the model is dumped.
+#
+# Each job's cut polygons come from the section engine and are filled
+# with a banded rainbow ramp (minimum, maximum, interval as in the FLAC3D
+# plot; "automatic" uses the section's range) on a white background, with
+# a colour bar on the left. Sweeps use their parallel camera (center,
+# eye, roll); axis slices look straight along the plane normal. Every
+# image of a sweep is framed on the whole model so frames line up in a
+# video. Images keep the plan's names (vert_slice_NNN...), so the video
+# tools work unchanged:
+#
+#   python -m slicekit.render --snapshot ./exports/model.snap --workers 8 \
+#       spec slab-review-code/sweeps.toml
+#   python -m slicekit.render --snapshot ./exports/model.snap \
+#       sweep --out-dir ./exports/max_principal/vertical_2 --origin ... ...
+#
+# Offline images are recorded in the plan's manifests with
+# renderer = "offline", so they never pass for FLAC3D renders. With
+# --rasters the scalar raster of each slice is kept next to its image
+# for re-colouring (slicekit.raster).
+#
+# Planes cutting no zone of the snapshot are left out of the plan (spec
+# run option skip_empty); the zone values are only read before
+# rendering when a spec sweep asks for ramp = "global".
+# ====================================================================
+
+import argparse
+import colorsys
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from slicekit.cli import add_plan_arguments, build_plan, needs_mesh
+from slicekit.extent import ZoneIndex
+from slicekit.manifest import ExportManifest
+from slicekit.snapshot import Snapshot
+
+SIZE = (1600, 1200)          # image size in pixels
+LEGEND_WIDTH = 0.16          # fraction of the width kept for the colour bar
+MARGIN = 0.04                # fraction of the drawing area left blank around the model
+LUT_SIZE = 1024              # entries of the continuous colour lookup table
+MAX_BANDS = 4096             # finer banding is drawn as a continuous ramp
+STATE_COLORS = [(220, 220, 220), (230, 25, 75), (60, 180, 75), (255, 225, 25),
+                (0, 130, 200), (245, 130, 48), (145, 30, 180), (70, 240, 240)]
+
+_mesh = None                 # per worker process, see _init_worker
+
+
+# ------------------------------
+# Colours
+# ------------------------------
+@functools.lru_cache(maxsize=32)
+def ramp_lut(n):
+    """(n, 3) uint8 rainbow lookup table, blue (entry 0) to red (entry n - 1)."""
+    hue = (1 - np.linspace(0, 1, n)) * 2 / 3          # 240 deg (blue) -> 0 deg (red)
+    rgb = [colorsys.hsv_to_rgb(h, 1.0, 1.0) for h in hue]
+    return (np.reshape(rgb, (-1, 3)) * 255).round().astype(np.uint8)
+
+
+def ramp_index(values, lo, hi, interval=None, log=False):
+    """
+    (index, n): entries of ramp_lut(n) for 'values' on the ramp lo..hi,
+    banded every 'interval' (in decades when 'log'). Values outside lo..hi
+    take the end colours.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind != "f":
+        values = values.astype(float)
+    if log:
+        if lo * hi <= 0:
+            raise ValueError(f"log ramp needs bounds of one sign, got {lo}..{hi}")
+        values, lo, hi = (np.log10(np.maximum(np.abs(values), np.finfo(values.dtype).tiny)),
+                          np.log10(abs(lo)), np.log10(abs(hi)))
+    span = (hi - lo) or 1.0
+    if interval:
+        bands = max(1, int(np.ceil(abs(span / interval))))
+        if bands <= MAX_BANDS:
+            index = np.clip(np.floor((values - lo) / interval), 0, bands - 1)
+            return index.astype(np.intp), bands
+    t = np.clip((values - lo) / span, 0, 1)
+    return np.rint(t * (LUT_SIZE - 1)).astype(np.intp), LUT_SIZE
+
+
+def rainbow(values, lo, hi, interval=None, log=False):
+    """RGB (K, 3) uint8 for 'values' on a blue (lo) to red (hi) ramp, see ramp_index."""
+    index, n = ramp_index(values, lo, hi, interval, log)
+    return ramp_lut(n)[index]
+
+
+def resolve_ramp(ramp, values, mask=None):
+    """
+    (minimum, maximum, interval); None or "automatic" entries take the
+    range of 'values' (where 'mask' is set).
+    """
+    if ramp is None or any(isinstance(r, str) for r in ramp):
+        values = np.asarray(values) if mask is None else values[mask]
+        return (float(values.min()), float(values.max()), None) if values.size else (0.0, 1.0, None)
+    return float(ramp[0]), float(ramp[1]), (float(ramp[2]) if ramp[2] else None)
+
+
+# ------------------------------
+# Views
+# ------------------------------
+def _vector(v):
+    if isinstance(v, str):
+        return np.array([float(c) for c in v.strip("()").split(",")])
+    return np.asarray(v, dtype=float)
+
+
+def camera_basis(center, eye, roll=0.0):
+    """(right, up) screen axes of a parallel view from 'eye' to 'center', rolled in degrees."""
+    forward = np.asarray(center, float) - np.asarray(eye, float)
+    forward /= np.linalg.norm(forward)
+    world_up = np.array([0.0, 0.0, 1.0]) if abs(forward[2]) < 0.99 else np.array([0.0, 1.0, 0.0])
+    right = np.cross(forward, world_up)
+    right /= np.linalg.norm(right)
+    up = np.cross(right, forward)
+    a = np.radians(roll)
+    return right * np.cos(a) + up * np.sin(a), up * np.cos(a) - right * np.sin(a)
+
+
+def job_view(params):
+    """(origin, normal, right, up, quantity, ramp) for a job's manifest params."""
+    origin = _vector(params["origin"])
+    normal = _vector(params["normal"])
+    view = params.get("view")
+    if view and len(view) == 3:                    # sweep: center, eye, roll
+        right, up = camera_basis(view[0], view[1], view[2])
+    else:                                          # axis slice: look along the normal
+        n = normal / np.linalg.norm(normal)
+        right, up = camera_basis(np.zeros(3), n, 0.0)
+    return origin, normal, right, up, params.get("quantity", "max"), params.get("ramp")
+
+
+# ------------------------------
+# Drawing
+# ------------------------------
+def _colour_bar(draw, box, ramp, log=False, font=None):
+    x0, y0, x1, y1 = box
+    steps = 256
+    colors = ramp_lut(steps)
+    h = (y1 - y0) / steps
+    for k, c in enumerate(colors):
+        top = y1 - (k + 1) * h
+        draw.rectangle([x0, top, x1, top + h + 1], fill=tuple(int(v) for v in c))
+    lo, hi = ramp[0], ramp[1]
+    for frac in (0.0, 0.25, 0.5, 0.75, 1.0):
+        value = lo * (hi / lo) ** frac if log else lo + frac * (hi - lo)
+        y = y1 - frac * (y1 - y0)
+        draw.text((x1 + 8, y - 6), f"{value:.4g}", fill=(0, 0, 0), font=font)
+
+
+def frame_transform(right, up, bounds, size=SIZE):
+    """
+    (scale, ox, oy) mapping a point p to pixel (ox + scale * p.right,
+    oy - scale * p.up), framing the box 'bounds' (lo, hi) right of the legend.
+    """
+    width, height = size
+    legend = int(width * LEGEND_WIDTH)
+    lo, hi = bounds
+    corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1])
+                        for z in (lo[2], hi[2])])
+    sx, sy = corners @ right, corners @ up
+    area_w, area_h = (width - legend) * (1 - 2 * MARGIN), height * (1 - 2 * MARGIN)
+    scale = min(area_w / ((sx.max() - sx.min()) or 1), area_h / ((sy.max() - sy.min()) or 1))
+    ox = legend + (width - legend - scale * (sx.max() - sx.min())) / 2 - scale * sx.min()
+    oy = (height + scale * (sy.max() - sy.min())) / 2 + scale * sy.min()
+    return scale, ox, oy
+
+
+def rasterise(section, right, up, bounds, size=SIZE):
+    """
+    (values, mask): float32 (height, width) raster of the section's zone
+    values seen along (right, up) and framed as frame_transform; 'mask' is
+    False outside the cut (values are 0 there).
+    """
+    from PIL import Image, ImageDraw
+
+    scale, ox, oy = frame_transform(right, up, bounds, size)
+    ids = Image.new("I", size, 0)                  # polygon k is drawn as k + 1
+    draw = ImageDraw.Draw(ids)
+    px = ox + scale * (section.polygons @ right)
+    py = oy - scale * (section.polygons @ up)
+    for k, n in enumerate(section.counts):
+        if n >= 3:
+            draw.polygon(list(zip(px[k, :n].tolist(), py[k, :n].tolist())), fill=k + 1)
+    ids = np.asarray(ids, dtype=np.int64) - 1
+    mask = ids >= 0
+    values = np.zeros(ids.shape, dtype=np.float32)
+    values[mask] = np.asarray(section.values, dtype=np.float32)[ids[mask]]
+    return values, mask
+
+
+def paint(values, mask, ramp=None, quantity="max", log=False):
+    """
+    PIL image of a raster: zones coloured through the rainbow lookup table
+    ('ramp' as in render_section, optionally 'log' scaled) or by state, on
+    white, with the colour bar on the left.
+    """
+    from PIL import Image, ImageDraw
+
+    height, width = values.shape
+    if quantity == "state":
+        lut = np.array(STATE_COLORS, dtype=np.uint8)
+        index = values.astype(np.int64) % len(lut)
+        ramp = None
+    else:
+        ramp = resolve_ramp(ramp, values, mask)
+        index, n = ramp_index(values, ramp[0], ramp[1], ramp[2], log)
+        lut = ramp_lut(n)
+    lut = np.vstack([lut, [[255, 255, 255]]]).astype(np.uint8)      # last entry: background
+    img = Image.fromarray(np.take(lut, np.where(mask, index, len(lut) - 1), axis=0))
+    if ramp is not None:
+        legend = int(width * LEGEND_WIDTH)
+        _colour_bar(ImageDraw.Draw(img),
+                    (legend * 0.25, height * 0.25, legend * 0.4, height * 0.75), ramp, log)
+    return img
+
+
+def render_section(section, right, up, bounds, size=SIZE, ramp=None, quantity="max"):
+    """
+    PIL image of 'section' seen along (right, up), framed on the box
+    'bounds' (lo, hi). 'ramp' is (minimum, maximum, interval) or None /
+    "automatic" entries for the section's own range.
+    """
+    values, mask = rasterise(section, right, up, bounds, size)
+    return paint(values, mask, ramp, quantity)
+
+
+def save_image(img, path):
+    ext = os.path.splitext(path)[1].lower()
+    tmp = path + ".part"
+    if ext == ".webp":
+        img.save(tmp, format="WEBP", lossless=True, method=4)
+    else:
+        img.save(tmp, format={".bmp": "BMP", ".png": "PNG", ".jpg": "JPEG",
+                              ".jpeg": "JPEG"}[ext])
+    os.replace(tmp, path)
+
+
+# ------------------------------
+# Process pool
+# ------------------------------
+def _init_worker(snapshot_path):
+    global _mesh
+    _mesh = Snapshot(snapshot_path).mesh()
+
+
+def render_job(job, size=SIZE, rasters=False):
+    """
+    Render one plan job with the worker's mesh; with 'rasters' its scalar
+    raster is kept next to the image. Returns (output, seconds).
+    """
+    from slicekit.raster import raster_path, save_raster, slice_raster
+
+    t0 = time.perf_counter()
+    values, mask, meta = slice_raster(_mesh, job["params"], size)
+    img = paint(values, mask, meta["ramp"], meta["quantity"])
+    save_image(img, job["output"])
+    if rasters:
+        save_raster(raster_path(job["output"]), values, mask, meta)
+    return job["output"], time.perf_counter() - t0
+
+
+def render_jobs(snapshot_path, jobs, workers=None, size=SIZE, resume=True, rasters=False):
+    """
+    Render 'jobs' from the snapshot on 'workers' processes (default: all
+    cores), skipping images already current in their manifests; with
+    'rasters' each image's scalar raster (slicekit.raster) is kept too.
+    Returns (rendered, skipped, wall seconds).
+    """
+    snap = Snapshot(snapshot_path)
+    manifests = {}
+    pending = []
+    for job in jobs:
+        path = job["manifest"]
+        if path not in manifests:
+            manifests[path] = ExportManifest(path, snap.state_hash)
+        params = dict(job["params"], renderer="offline", size=list(size))
+        if rasters:
+            params["raster"] = True
+        if resume and manifests[path].is_current(job["output"], params):
+            continue
+        pending.append((job, params))
+
+    t0 = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(snapshot_path,)) as pool:
+        futures = [(job, params, pool.submit(render_job, job, size, rasters))
+                   for job, params in pending]
+        for n, (job, params, future) in enumerate(futures, start=1):
+            output, seconds = future.result()
+            manifests[job["manifest"]].record(output, params)
+            print(f"[{n}/{len(futures)}] {output} ({seconds:.2f} s)")
+    for m in manifests.values():
+        m.flush()
+    return len(pending), len(jobs) - len(pending), time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render a slice plan from a model snapshot.")
+    ap.add_argument("--snapshot", required=True, help="folder written by slicekit.snapshot")
+    ap.add_argument("--workers", type=int, help="render processes (default: all cores)")
+    ap.add_argument("--size", type=int, nargs=2, default=SIZE, metavar=("WIDTH", "HEIGHT"))
+    ap.add_argument("--no-resume", action="store_true", help="re-render current images")
+    ap.add_argument("--rasters", action="store_true",
+                    help="keep a scalar raster next to each image (see slicekit.raster)")
+    add_plan_arguments(ap)
+    args = ap.parse_args(argv)
+
+    # the zone values are only read here for global ramps; the workers read their own mesh.
+    # Planes are checked against every zone, not only the mesh's bricks.
+    snap = Snapshot(args.snapshot)
+    mesh = snap.mesh() if needs_mesh(args) else None
+    jobs = build_plan(args, mesh=mesh, zones=ZoneIndex.from_boxes(*snap.zone_boxes()))
+    rendered, skipped, wall = render_jobs(args.snapshot, jobs, args.workers,
+                                          tuple(args.size), not args.no_resume, args.rasters)
+    rate = rendered / wall if wall else 0.0
+    print(f"Rendered {rendered} images in {wall:.1f} s ({rate:.1f}/s), "
+          f"skipped {skipped} already current")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# ====================================================================
+# slicekit/scheduler.py
+# --------------------------------------------------------------------
+# Splits a slice plan across N worker FLAC3D consoles that each restore
+# the same saved model state and render their share, then merges the
+# workers' manifests. Images are written straight into the usual
+# ./exports layout, so the result is the same as a serial run.
+#
+# Run from the project folder (the one holding ./exports):
+#
+#   python -m slicekit.scheduler --workers 4 --state model.f3sav \
+#       --flac3d "C:/Program Files/Itasca/FLAC3D900/exe64/flac3d900_console.exe" \
+#       axis x:90:265:5 y:90:265:5 z:980:1080:5
+#
+#   python -m slicekit.scheduler --workers 4 --state model.f3sav --flac3d ... \
+#       sweep --out-dir ./exports/max_principal/vertical_2 \
+#       --origin 51.7136 96.7497 980 --normal 0.390731 0.920505 6.12323e-17 \
+#       --spacing 0.5 --count 420 --ramp 0 100000 50 \
+#       --center 143.95518 114.28977 964.47347 --eye 51.765629 -298.42382 1001.1944 \
+#       --roll 0.064852696
+#
+# Replace --flac3d with --stub [seconds] to run the workers against the
+# stub itasca module (simulated render time per image) and measure
+# scaling without a licence.
+# ====================================================================
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from slicekit.cli import add_plan_arguments, build_plan
+from slicekit.manifest import merge_partials
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_DIR = os.path.join(REPO_ROOT, "slicekit", "stub")
+WORKER_PY = os.path.join(REPO_ROOT, "slicekit", "worker.py")
+SCRATCH_DIR = os.path.join(".", "exports", ".scheduler")
+
+# Data file each FLAC3D console runs; the worker script reads SLICEKIT_JOB
+WORKER_DAT = '''program call "{worker}"
+program quit
+'''
+
+
+def partition(jobs, n):
+    """
+    Split 'jobs' into at most 'n' contiguous shares of similar size without
+    separating jobs that share a plot and cut plane, so each worker keeps
+    the plot reuse of the serial order.
+    """
+    groups = []
+    for job in jobs:
+        key = (job["plot"], job["plane"])
+        if groups and groups[-1][0] == key:
+            groups[-1][1].append(job)
+        else:
+            groups.append((key, [job]))
+
+    size = -(-len(jobs) // max(n, 1))
+    shares = [[]]
+    for _, group in groups:
+        if len(shares[-1]) >= size and len(shares) < n:
+            shares.append([])
+        shares[-1].extend(group)
+    return [share for share in shares if share]
+
+
+def _launch(job_file, flac3d=None, stub_latency=None):
+    env = dict(os.environ, SLICEKIT_JOB=os.path.abspath(job_file))
+    if flac3d:
+        dat = job_file[:-len(".json")] + ".dat"
+        with open(dat, "w", encoding="utf-8") as f:
+            f.write(WORKER_DAT.format(worker=WORKER_PY.replace("\\", "/")))
+        cmd = [flac3d, dat]
+    else:
+        env["PYTHONPATH"] = os.pathsep.join([STUB_DIR, REPO_ROOT, env.get("PYTHONPATH", "")])
+        if stub_latency is not None:
+            env["SLICEKIT_STUB_LATENCY"] = str(stub_latency)
+        cmd = [sys.executable, "-m", "slicekit.worker"]
+    log = open(job_file[:-len(".json")] + ".log", "w", encoding="utf-8")
+    return subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT), log
+
+
+def run_parallel(jobs, workers, state=None, flac3d=None, stub_latency=None, resume=True):
+    """
+    Render 'jobs' with 'workers' processes. Either 'flac3d' (path to the
+    console executable) or stub mode (flac3d=None) must be chosen.
+    Returns the list of per-worker summaries.
+    """
+    manifest_paths = sorted({job["manifest"] for job in jobs})
+    for path in manifest_paths:
+        merge_partials(path)   # leftovers from an interrupted run
+
+    os.makedirs(SCRATCH_DIR, exist_ok=True)
+    for name in os.listdir(SCRATCH_DIR):   # job files and logs of the previous run
+        os.remove(os.path.join(SCRATCH_DIR, name))
+    shares = partition(jobs, workers)
+    state = os.path.abspath(state) if state else None
+
+    t0 = time.perf_counter()
+    procs = []
+    for w, share in enumerate(shares):
+        job_file = os.path.join(SCRATCH_DIR, f"worker_{w}.json")
+        if os.path.exists(job_file + ".done"):
+            os.remove(job_file + ".done")
+        with open(job_file, "w", encoding="utf-8") as f:
+            json.dump({"worker": w, "state": state, "resume": resume, "jobs": share}, f)
+        procs.append((w, job_file) + _launch(job_file, flac3d, stub_latency))
+    print(f"Started {len(procs)} workers for {len(jobs)} images")
+
+    summaries = []
+    for w, job_file, proc, log in procs:
+        code = proc.wait()
+        log.close()
+        if code != 0 or not os.path.exists(job_file + ".done"):
+            print(f"Worker {w} failed (exit code {code}); see {job_file[:-5]}.log")
+            continue
+        with open(job_file + ".done", "r", encoding="utf-8") as f:
+            summaries.append(json.load(f))
+    wall = time.perf_counter() - t0
+
+    for path in manifest_paths:
+        merge_partials(path)
+
+    rendered = sum(s["rendered"] for s in summaries)
+    skipped = sum(s["skipped"] for s in summaries)
+    for s in summaries:
+        print(f"  worker {s['worker']}: {s['rendered']} rendered, {s['skipped']} skipped "
+              f"in {s['seconds']:.2f} s (restore {s['restore_seconds']:.2f} s)")
+    rate = rendered / wall if wall > 0 else 0.0
+    print(f"{rendered} rendered, {skipped} skipped with {len(shares)} workers "
+          f"in {wall:.2f} s ({rate:.2f} images/s)")
+    return summaries
+
+
+# ------------------------------
+# Command line
+# ------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a slice plan with parallel FLAC3D workers.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--state", help="saved model state (.f3sav) each worker restores")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--flac3d", help="path to the FLAC3D console executable")
+    mode.add_argument("--stub", nargs="?", type=float, const=0.05, metavar="SECONDS",
+                      help="use the stub itasca module with this render time per image")
+    parser.add_argument("--no-resume", dest="resume", action="store_false")
+    add_plan_arguments(parser)
+
+    args = parser.parse_args(argv)
+    jobs = build_plan(args)
+    run_parallel(jobs, args.workers, state=args.state, flac3d=args.flac3d,
+                 stub_latency=args.stub, resume=args.resume)
+
+
+if __name__ == "__main__":
+    main()
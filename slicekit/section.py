@@ -0,0 +1,316 @@
+# ====================================================================
+# slicekit/section.py
+# --------------------------------------------------------------------
+# Plane sections of the zone mesh in NumPy, independent of FLAC3D's
+# plot cut. ZoneMesh pulls gridpoint positions, zone connectivity and
+# the exported quantities once through the bulk array accessors
+# (it.gridpointarray / it.zonearray, per-zone fallback otherwise);
+# section() then intersects every zone with a plane in one vectorized
+# pass and returns the cut polygons with one value per polygon.
+#
+# Zones are handled as bricks in FLAC3D's gridpoint order (degenerate
+# bricks included); a plane cuts a convex brick in at most six points.
+# Zones with fewer than 8 gridpoints (wedges, pyramids, tetrahedra) are
+# not sectioned: they are left out of the mesh, with their number logged,
+# and show as holes in sections, rasters and offline renders.
+# ZoneMesh.block() builds a regular hex mesh for use without FLAC3D:
+#
+#   mesh = ZoneMesh.block((0, 0, 0), (100, 100, 50), (20, 20, 10))
+#   sec = mesh.section((50, 0, 0), (1, 0, 0), "zz")
+# ====================================================================
+
+import numpy as np
+
+from slicekit.extent import AXES
+
+# Brick edges as gridpoint pairs; FLAC3D brick order is
+# 0 (0,0,0)  1 (1,0,0)  2 (0,1,0)  3 (0,0,1)  4 (1,1,0)  5 (0,1,1)  6 (1,0,1)  7 (1,1,1)
+BRICK_EDGES = np.array([
+    (0, 1), (2, 4), (3, 6), (5, 7),     # along x
+    (0, 2), (1, 4), (3, 5), (6, 7),     # along y
+    (0, 3), (1, 6), (2, 5), (4, 7),     # along z
+])
+BRICK_CORNERS = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1),
+                 (1, 1, 0), (0, 1, 1), (1, 0, 1), (1, 1, 1)]
+
+
+# ------------------------------
+# Zone quantities (FLAC3D sign convention: compression negative, so the
+# maximum principal stress is the most compressive, smallest value)
+# ------------------------------
+def effective_stress(stress, pp):
+    """Effective stress tensors (N, 3, 3) from total stress and pore pressure."""
+    return stress + pp[:, None, None] * np.eye(3)
+
+
+def zone_quantities(stress, pp, zone_disp):
+    """Per-zone values of the exported quantities, keyed like axis_slices.QUANTITIES."""
+    eff = effective_stress(stress, pp)
+    principal = np.linalg.eigvalsh(eff)      # ascending
+    return {
+        "disp": np.linalg.norm(zone_disp, axis=1),
+        "max": principal[:, 0],
+        "min": principal[:, 2],
+        "zz": eff[:, 2, 2],
+    }
+
+
+def plane_basis(normal):
+    """Unit (u, v) spanning the plane; axis planes get (y,z), (x,z) and (x,y)."""
+    n = np.asarray(normal, dtype=float)
+    n = n / np.linalg.norm(n)
+    if abs(n[2]) > 0.9:                       # near-horizontal plane: u along x
+        u = np.cross((0.0, 1.0, 0.0), n)
+    else:
+        u = np.cross((0.0, 0.0, 1.0), n)
+    u = u / np.linalg.norm(u)
+    return u, np.cross(n, u)
+
+
+class Section:
+    """
+    Cut polygons of one plane: 'polygons' (K, V, 3) padded with NaN,
+    'counts' (K,) vertices per polygon, 'zones' (K,) zone row of each and
+    'values' (K,) the quantity on it (None when no quantity was asked).
+    """
+
+    def __init__(self, origin, normal, polygons, counts, zones, values):
+        self.origin = np.asarray(origin, dtype=float)
+        self.normal = np.asarray(normal, dtype=float)
+        self.polygons = polygons
+        self.counts = counts
+        self.zones = zones
+        self.values = values
+
+    def __len__(self):
+        return len(self.zones)
+
+    def uv(self):
+        """Polygon vertices in in-plane coordinates, (K, V, 2), NaN padded."""
+        u, v = plane_basis(self.normal)
+        rel = self.polygons - self.origin
+        return np.stack([rel @ u, rel @ v], axis=-1)
+
+    def areas(self):
+        """Area of each polygon (shoelace), (K,)."""
+        uv = np.nan_to_num(self.uv())
+        x, y = uv[..., 0], uv[..., 1]
+        idx = np.arange(uv.shape[1])
+        nxt = np.where(idx[None, :] + 1 < self.counts[:, None], idx + 1, 0)
+        x2 = np.take_along_axis(x, nxt, axis=1)
+        y2 = np.take_along_axis(y, nxt, axis=1)
+        valid = idx[None, :] < self.counts[:, None]
+        return 0.5 * np.abs(np.where(valid, x * y2 - x2 * y, 0).sum(axis=1))
+
+    def area(self):
+        """Total cut area."""
+        return self.areas().sum()
+
+
+def read_model(it):
+    """
+    Raw mesh and fields of the loaded model as NumPy arrays: gp_pos, gp_disp
+    (M, 3); zone_gridpoints (N, 8, -1 padded); zone_stress (N, 3, 3, total);
+    zone_pp, zone_state (N,); zone_null (N, bool). Everything comes from
+    the bulk array accessors, the null flag from zonearray.live_mechanical()
+    and the state from zonearray.state(). Consoles without those two fall
+    back to a per-zone walk for them (z.model(), z.state()), and consoles
+    without it.gridpointarray / it.zonearray to a per-zone walk for all.
+    """
+    try:
+        m = {
+            "gp_pos": np.asarray(it.gridpointarray.pos(), dtype=float),
+            "gp_disp": np.asarray(it.gridpointarray.disp(), dtype=float),
+            "zone_gridpoints": np.asarray(it.zonearray.gridpoints(), dtype=np.int64),
+            "zone_stress": np.asarray(it.zonearray.stress(), dtype=float).reshape(-1, 3, 3),
+            "zone_pp": np.asarray(it.zonearray.pp(), dtype=float),
+        }
+    except AttributeError:
+        return _walk_model(it)
+    try:
+        m["zone_null"] = ~np.asarray(it.zonearray.live_mechanical(), dtype=bool)
+    except AttributeError:
+        m["zone_null"] = np.array([z.model() == "null" for z in it.zone.list()], dtype=bool)
+    try:
+        m["zone_state"] = np.asarray(it.zonearray.state(True), dtype=np.int32)
+    except AttributeError:
+        m["zone_state"] = np.array([z.state() for z in it.zone.list()], dtype=np.int32)
+    return m
+
+
+def _walk_model(it):
+    rows = {}
+    points, disp = [], []
+    for gp in it.gridpoint.list():
+        rows[gp.id()] = len(points)
+        points.append(gp.pos())
+        disp.append(gp.disp())
+    bricks, stress, pp, null, state = [], [], [], [], []
+    for z in it.zone.list():
+        gps = [rows[gp.id()] for gp in z.gridpoints()]
+        bricks.append((gps + [-1] * 8)[:8] if len(gps) == 8 else [-1] * 8)
+        stress.append(np.asarray(z.stress(), dtype=float).reshape(3, 3))
+        pp.append(z.pp())
+        null.append(z.model() == "null")
+        state.append(z.state())
+    return {
+        "gp_pos": np.reshape(np.asarray(points, dtype=float), (-1, 3)),
+        "gp_disp": np.reshape(np.asarray(disp, dtype=float), (-1, 3)),
+        "zone_gridpoints": np.reshape(np.asarray(bricks, dtype=np.int64), (-1, 8)),
+        "zone_stress": np.reshape(np.asarray(stress, dtype=float), (-1, 3, 3)),
+        "zone_pp": np.asarray(pp, dtype=float),
+        "zone_null": np.asarray(null, dtype=bool),
+        "zone_state": np.asarray(state, dtype=np.int32),
+    }
+
+
+def brick_rows(zone_gridpoints, zone_null=None):
+    """
+    Rows of the zones a ZoneMesh keeps: those with 8 gridpoints, less the
+    'zone_null' ones when given. Dropped non-brick zones are logged.
+    """
+    live = np.ones(len(zone_gridpoints), dtype=bool)
+    if zone_null is not None:
+        live &= ~np.asarray(zone_null, dtype=bool)
+    brick = np.all(np.asarray(zone_gridpoints) >= 0, axis=1)
+    dropped = int((live & ~brick).sum())
+    if dropped:
+        print(f"{dropped} zones with fewer than 8 gridpoints (wedges, pyramids, tetrahedra) "
+              f"are left out of the sections")
+    return np.flatnonzero(live & brick)
+
+
+class ZoneMesh:
+    """Gridpoint positions, brick connectivity and per-zone quantities."""
+
+    def __init__(self, points, bricks, zone_values=None):
+        self.points = np.asarray(points, dtype=float)
+        self.bricks = np.asarray(bricks, dtype=np.int64)
+        self.zone_values = zone_values or {}
+        corners = self.points[self.bricks]
+        self.lo = corners.min(axis=1)
+        self.hi = corners.max(axis=1)
+
+    def __len__(self):
+        return len(self.bricks)
+
+    # ------------------------------
+    # Construction
+    # ------------------------------
+    @classmethod
+    def from_model(cls, it, skip_null=True):
+        """
+        Mesh and quantities of the loaded model (see read_model). Null zones
+        are dropped with 'skip_null', and zones that are not bricks always
+        (see brick_rows).
+        """
+        m = read_model(it)
+        keep = brick_rows(m["zone_gridpoints"], m["zone_null"] if skip_null else None)
+        bricks = m["zone_gridpoints"][keep]
+        values = zone_quantities(m["zone_stress"][keep], m["zone_pp"][keep],
+                                 m["gp_disp"][bricks].mean(axis=1))
+        values["state"] = m["zone_state"][keep]
+        return cls(m["gp_pos"], bricks, values)
+
+    @classmethod
+    def block(cls, lo, hi, shape, fields=None):
+        """
+        Regular hex mesh over the box lo..hi with shape (nx, ny, nz) zones.
+        'fields' maps names to functions of the zone centroids (N, 3);
+        by default a lithostatic-like 'zz' and 'max' and a 'disp' bowl.
+        """
+        lo, hi = np.asarray(lo, float), np.asarray(hi, float)
+        nx, ny, nz = shape
+        axes = [np.linspace(lo[a], hi[a], n + 1) for a, n in enumerate(shape)]
+        gx, gy, gz = np.meshgrid(*axes, indexing="ij")
+        points = np.column_stack([gx.ravel(), gy.ravel(), gz.ravel()])
+
+        def gp(i, j, k):
+            return (i * (ny + 1) + j) * (nz + 1) + k
+
+        i, j, k = np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz), indexing="ij")
+        bricks = np.stack([gp(i + a, j + b, k + c).ravel() for a, b, c in BRICK_CORNERS],
+                          axis=1)
+        centroids = points[bricks].mean(axis=1)
+        if fields is None:
+            depth = hi[2] - centroids[:, 2]
+            r = np.linalg.norm((centroids - (lo + hi) / 2)[:, :2], axis=1)
+            fields = {"zz": lambda c: -25000.0 * depth,
+                      "max": lambda c: -25000.0 * depth * 1.2,
+                      "disp": lambda c: 0.01 * np.exp(-(r / (r.max() or 1.0)) ** 2)}
+        return cls(points, bricks, {name: f(centroids) for name, f in fields.items()})
+
+    # ------------------------------
+    # Sections
+    # ------------------------------
+    def section(self, origin, normal, quantity=None):
+        """
+        Section of the mesh by the plane through 'origin' with 'normal'.
+        A plane on a face shared by two zones cuts it once (from the zone
+        on its negative side); faces on the mesh boundary are cut from
+        either side, and zones only touched along an edge or at a corner
+        are left out.
+        """
+        origin = np.asarray(origin, dtype=float)
+        normal = np.asarray(normal, dtype=float)
+        d = (self.points - origin) @ normal              # signed distance per gridpoint
+        dz = d[self.bricks]                               # (N, 8)
+        dmin, dmax = dz.min(axis=1), dz.max(axis=1)
+        inside = (dmin < 0) & (dmax >= 0)
+        cut = np.flatnonzero(inside)
+        # zones lying on the plane from its positive side: only where no zone below has that face
+        above = np.flatnonzero((dmin == 0) & (dmax > 0))
+        if len(above):
+            below = np.flatnonzero(inside & (dmax == 0))
+            above = above[~np.isin(self._face_keys(above, dz), self._face_keys(below, dz))]
+            cut = np.concatenate([cut, above])
+        on_face = np.zeros(len(cut), dtype=bool)
+        on_face[len(cut) - len(above):] = True
+
+        da = dz[cut][:, BRICK_EDGES[:, 0]]                # (K, 12)
+        db = dz[cut][:, BRICK_EDGES[:, 1]]
+        # gridpoints on the plane count as above it, or below it for zones cut on_face
+        crosses = np.where(on_face[:, None], (da <= 0) != (db <= 0), (da < 0) != (db < 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(crosses, da / (da - db), np.nan)
+        pa = self.points[self.bricks[cut][:, BRICK_EDGES[:, 0]]]   # (K, 12, 3)
+        pb = self.points[self.bricks[cut][:, BRICK_EDGES[:, 1]]]
+        pts = pa + t[..., None] * (pb - pa)                         # NaN where no crossing
+
+        # order each polygon's vertices by angle about its centroid
+        u, v = plane_basis(normal)
+        with np.errstate(invalid="ignore"):
+            rel = pts - np.nanmean(pts, axis=1, keepdims=True)
+        angle = np.arctan2(rel @ v, rel @ u)                        # NaN sorts last
+        order = np.argsort(angle, axis=1)
+        pts = np.take_along_axis(pts, order[..., None], axis=1)
+        counts = crosses.sum(axis=1)
+        width = int(counts.max()) if len(counts) else 0
+        section = Section(origin, normal, pts[:, :width], counts, cut, None)
+
+        # drop degenerate polygons (zones touching the plane along an edge or at a corner)
+        extent = float(np.ptp(self.points, axis=0).max()) if len(self.points) else 1.0
+        keep = section.areas() > 1e-12 * extent ** 2
+        section.polygons, section.counts = section.polygons[keep], section.counts[keep]
+        section.zones = cut[keep]
+        if quantity is not None:
+            section.values = self.zone_values[quantity][section.zones]
+        return section
+
+    def _face_keys(self, rows, dz):
+        """Void keys of the gridpoints of 'rows' lying on the plane (dz == 0), for matching."""
+        ids = np.sort(np.where(dz[rows] == 0, self.bricks[rows], -1), axis=1)
+        return np.ascontiguousarray(ids).view(np.dtype((np.void, ids.dtype.itemsize * 8))).ravel()
+
+    def axis_section(self, axis, position, quantity=None):
+        """Section by the axis plane axis = position (as in axis_slices.plane_params)."""
+        origin = np.zeros(3)
+        origin[AXES[axis.lower()]] = position
+        normal = np.zeros(3)
+        normal[AXES[axis.lower()]] = 1.0
+        return self.section(origin, normal, quantity)
+
+    def sections(self, origins, normals, quantity=None):
+        """Sections for rows of (origins, normals), e.g. from slicekit.geometry."""
+        normals = np.broadcast_to(np.asarray(normals, dtype=float), np.shape(origins))
+        return [self.section(o, n, quantity) for o, n in zip(origins, normals)]
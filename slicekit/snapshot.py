@@ -0,0 +1,181 @@
+# ====================================================================
+# slicekit/snapshot.py
+# --------------------------------------------------------------------
+# One-shot dump of the loaded model for post-processing without a live
+# FLAC3D console. A snapshot is a folder of flat .npy arrays plus a
+# small versioned header:
+#
+#   model.snap/
+#     header.json          format, version, model state hash, arrays
+#     gp_pos.npy           (M, 3)  gridpoint positions
+#     gp_disp.npy          (M, 3)  gridpoint displacements
+#     zone_gridpoints.npy  (N, 8)  brick connectivity (-1 padded)
+#     zone_centroid.npy    (N, 3)
+#     zone_stress.npy      (N, 6)  effective stress xx yy zz xy yz xz
+#     zone_state.npy       (N,)    plasticity state flags
+#     zone_null.npy        (N,)    null zones
+#
+# .npy files are memory-mapped on open, so even multi-GB models open in
+# milliseconds and only the parts read are paged in. In FLAC3D:
+#
+#   from slicekit.snapshot import export_snapshot
+#   export_snapshot(it, "./exports/model.snap", float32=True)
+#
+# and anywhere else:  python -m slicekit.snapshot ./exports/model.snap
+# ====================================================================
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from slicekit.manifest import model_state_hash
+from slicekit.section import (ZoneMesh, brick_rows, effective_stress, read_model,
+                              zone_quantities)
+
+FORMAT = "slicekit-snapshot"
+VERSION = 1
+HEADER = "header.json"
+
+# symmetric tensor components stored, as (row, column)
+STRESS_COMPONENTS = ((0, 0), (1, 1), (2, 2), (0, 1), (1, 2), (0, 2))
+
+
+def export_snapshot(it, path, float32=False, overwrite=True):
+    """
+    Write the loaded model to the snapshot folder 'path' and return its
+    header. Positions stay float64; fields are stored as float32 with
+    'float32'. The folder is written beside 'path' and swapped in at the end.
+    """
+    if os.path.exists(path) and not overwrite:
+        raise FileExistsError(path)
+    t0 = time.perf_counter()
+    m = read_model(it)
+    field = np.float32 if float32 else np.float64
+    bricks = m["zone_gridpoints"]
+    valid = bricks >= 0
+    corners = m["gp_pos"][np.where(valid, bricks, 0)]
+    centroid = (corners * valid[..., None]).sum(axis=1) / np.maximum(valid.sum(axis=1), 1)[:, None]
+    eff = effective_stress(m["zone_stress"], m["zone_pp"])
+    arrays = {
+        "gp_pos": m["gp_pos"],
+        "gp_disp": m["gp_disp"].astype(field),
+        "zone_gridpoints": bricks.astype(np.int32 if len(m["gp_pos"]) < 2 ** 31 else np.int64),
+        "zone_centroid": centroid,
+        "zone_stress": np.stack([eff[:, i, j] for i, j in STRESS_COMPONENTS], axis=1).astype(field),
+        "zone_state": m["zone_state"].astype(np.int32),
+        "zone_null": m["zone_null"],
+    }
+
+    tmp = path.rstrip("/\\") + ".part"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, a in arrays.items():
+        np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(a))
+    header = {
+        "format": FORMAT,
+        "version": VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "state_hash": model_state_hash(it),
+        "gridpoints": len(arrays["gp_pos"]),
+        "zones": len(arrays["zone_gridpoints"]),
+        "arrays": {name: {"shape": list(a.shape), "dtype": a.dtype.str}
+                   for name, a in arrays.items()},
+    }
+    with open(os.path.join(tmp, HEADER), "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=1)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    print(f"Snapshot of {header['zones']} zones written to {path} "
+          f"in {time.perf_counter() - t0:.1f} s")
+    return header
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot folder. Arrays are loaded on first use,
+    memory-mapped unless mmap=False: snap["zone_stress"], snap.mesh().
+    """
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        self.mmap = mmap
+        with open(os.path.join(path, HEADER), "r", encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a slicekit snapshot")
+        if self.header.get("version", 0) > VERSION:
+            raise ValueError(f"{path} is snapshot version {self.header['version']}; "
+                             f"this slicekit reads up to version {VERSION}")
+        self._arrays = {}
+
+    @property
+    def state_hash(self):
+        return self.header["state_hash"]
+
+    def __contains__(self, name):
+        return name in self.header["arrays"]
+
+    def __getitem__(self, name):
+        if name not in self._arrays:
+            if name not in self:
+                raise KeyError(name)
+            self._arrays[name] = np.load(os.path.join(self.path, name + ".npy"),
+                                         mmap_mode="r" if self.mmap else None)
+        return self._arrays[name]
+
+    def stress(self, rows=slice(None)):
+        """Effective stress tensors (n, 3, 3) for zone 'rows'."""
+        s6 = np.asarray(self["zone_stress"][rows], dtype=float)
+        t = np.empty((len(s6), 3, 3))
+        for k, (i, j) in enumerate(STRESS_COMPONENTS):
+            t[:, i, j] = t[:, j, i] = s6[:, k]
+        return t
+
+    def zone_boxes(self, skip_null=True):
+        """(lo, hi) bounding boxes of the zones, as extent.zone_boxes, without the quantities."""
+        gps = np.asarray(self["zone_gridpoints"], dtype=np.int64)
+        keep = gps[:, 0] >= 0
+        if skip_null:
+            keep &= ~np.asarray(self["zone_null"])
+        gps = gps[keep]
+        corners = np.asarray(self["gp_pos"], dtype=float)[np.where(gps >= 0, gps, gps[:, :1])]
+        return corners.min(axis=1), corners.max(axis=1)
+
+    def mesh(self, skip_null=True):
+        """
+        ZoneMesh (slicekit.section) with the exported quantities; zones that
+        are not bricks are left out (see section.brick_rows).
+        """
+        bricks = np.asarray(self["zone_gridpoints"], dtype=np.int64)
+        rows = brick_rows(bricks, self["zone_null"] if skip_null else None)
+        bricks = bricks[rows]
+        gp_disp = np.asarray(self["gp_disp"], dtype=float)
+        values = zone_quantities(self.stress(rows), np.zeros(len(rows)),
+                                 gp_disp[bricks].mean(axis=1))
+        values["state"] = np.asarray(self["zone_state"])[rows]
+        return ZoneMesh(self["gp_pos"], bricks, values)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Describe a model snapshot.")
+    ap.add_argument("path")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    snap = Snapshot(args.path)
+    t_open = time.perf_counter() - t0
+    h = snap.header
+    print(f"{args.path}: {FORMAT} v{h['version']}, {h['zones']} zones, "
+          f"{h['gridpoints']} gridpoints, state {h['state_hash']}, created {h['created']}")
+    for name, a in h["arrays"].items():
+        print(f"  {name:16s} {str(tuple(a['shape'])):14s} {a['dtype']}")
+    print(f"opened in {t_open * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
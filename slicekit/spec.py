@@ -0,0 +1,418 @@
+# ====================================================================
+# slicekit/spec.py
+# --------------------------------------------------------------------
+# Declarative sweep specifications. A TOML (or YAML) file lists the
+# sweeps to export; it is expanded into a slice plan (one NumPy record
+# per plane: origin, normal, camera and ramp), duplicates are dropped,
+# and the plan is turned into the usual job dicts and rendered:
+#
+#   [run]                      # optional, defaults shown in RUN_DEFAULTS
+#   format = "bmp"
+#   compile = true
+#
+#   [defaults]                 # merged into every sweep
+#   spacing = 0.5
+#   ramp = [0, 100000, 50]
+#
+#   [[sweep]]                  # oblique sweep with a fixed camera
+#   kind = "plane"
+#   out_dir = "./exports/max_principal/vertical_1"
+#   origin = [63.918, 174.661, 980.0]
+#   normal = [-0.927184, 0.374607, 6.12323e-17]
+#   count = 260
+#   direction = -1
+#   center = [118.6423, 186.62776, 970.54353]
+#   eye = [-344.4808, 253.49691, 977.97595]
+#   roll = 359.79744
+#
+#   [[sweep]]                  # axis slices as in data-export-report
+#   kind = "axis"
+#   axis = "z"
+#   start = 980
+#   end = 1080
+#   step = 0.5
+#   keys = ["max"]
+#   outline = false            # optional: no zone edges (default true)
+#   name_format = ".1f"        # optional: positions as 980.0, 980.5, ...
+#
+# Camera sweeps can also be "bidirectional" (back/forward step counts
+# either side of origin), "radial" (normal turning angle_step degrees
+# per slice about rotation_axis through origin) or "polyline" (planes
+# normal to the path through 'points', every 'spacing'); see
+# slicekit.geometry. Any camera sweep may give clip = [xmin, ymin, zmin,
+# xmax, ymax, zmax] to drop planes missing that box. Inside FLAC3D and
+# in the offline renderer, planes cutting no zone of the model are
+# dropped as well (run option skip_empty, see slicekit.extent).
+#
+# ramp = "global" replaces fixed or "automatic" bounds by one ramp per
+# sweep (and per quantity on axis sweeps) computed from the zones its
+# planes cut; ramp_percentiles = [1, 99] clips outliers and ramp_bands
+# sets the number of contour bands (see slicekit.ramps). Global ramps
+# need the model: inside FLAC3D, or a snapshot for slicekit.render.
+#
+# Inside FLAC3D: spec.run_spec(it, "sweeps.toml"). Outside, the same
+# file plans scheduler/batch runs ('spec sweeps.toml') or is summarised:
+#
+#   python -m slicekit.spec sweeps.toml
+# ====================================================================
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from slicekit import axis_slices, geometry, ramps, sweep
+from slicekit.extent import ZoneIndex, report_skipped
+
+RUN_DEFAULTS = {
+    "format": "bmp",          # image format, as in images.output_paths()
+    "background": False,      # FLAC3D writes BMP, converted on a background thread
+    "reuse_plot": True,
+    "skip_empty": True,       # drop planes that cut no zone of the loaded model
+    "resume": True,
+    "compile": False,         # render through generated data files
+    "batch_size": 100,
+    "video": False,           # encode camera sweeps to <out_dir>/video_slices.mp4 while rendering
+    "keep_frames": True,
+    "video_fps": 5,
+    "video_python": "python",
+    "rasters": False,         # keep a scalar raster next to each image (slicekit.raster)
+}
+
+CAMERA_DEFAULTS = {"spacing": 0.5, "ramp": [0, 100000, 50], "roll": 0.0, "dpi": 300,
+                   "clip": None}
+SWEEP_DEFAULTS = {
+    "plane": dict(CAMERA_DEFAULTS, direction=1),
+    "bidirectional": dict(CAMERA_DEFAULTS),
+    "radial": dict(CAMERA_DEFAULTS, start_angle=0.0),
+    "polyline": dict(CAMERA_DEFAULTS),
+    "axis": {"base_dir": axis_slices.BASE_DIR, "keys": None, "ramp": None,
+             "dpi": axis_slices.DPI, "outline": True, "name_format": None},
+}
+CAMERA = ("out_dir", "center", "eye")
+REQUIRED = {
+    "plane": CAMERA + ("origin", "normal", "count"),
+    "bidirectional": CAMERA + ("origin", "normal", "back", "forward"),
+    "radial": CAMERA + ("origin", "rotation_axis", "normal", "angle_step", "count"),
+    "polyline": CAMERA + ("points",),
+    "axis": ("axis", "start", "end", "step"),
+}
+
+AXES = {"x": 0, "y": 1, "z": 2}
+GLOBAL = "global"         # ramp computed from the zones a sweep cuts
+
+PLAN_DTYPE = np.dtype([
+    ("sweep", "i4"),          # index into the expanded sweep list
+    ("index", "i4"),          # 1-based slice number within its sweep
+    ("origin", "f8", 3),
+    ("normal", "f8", 3),
+    ("center", "f8", 3),      # camera (NaN for axis sweeps, which use dip views)
+    ("eye", "f8", 3),
+    ("roll", "f8"),
+    ("ramp", "f8", 3),        # minimum, maximum, interval (NaN: quantity default)
+])
+
+
+def load_spec(path):
+    """Read a .toml, .yaml or .yml sweep specification into a dict."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".toml":
+        try:
+            import tomllib
+        except ImportError:        # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError("TOML sweep specs need Python 3.11+ or tomli "
+                                  "(pip install tomli in the FLAC3D Python)")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if ext in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("PyYAML is required for YAML sweep specs (pip install pyyaml)")
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    raise ValueError(f"Unsupported sweep spec format: {path}")
+
+
+def sweeps(spec):
+    """The spec's sweeps with [defaults] and per-kind defaults filled in."""
+    out = []
+    for n, entry in enumerate(spec.get("sweep", [])):
+        sw = dict(spec.get("defaults", {}), **entry)
+        kind = sw.setdefault("kind", "plane")
+        if kind not in SWEEP_DEFAULTS:
+            raise ValueError(f"sweep {n}: unknown kind {kind!r}")
+        sw = dict(SWEEP_DEFAULTS[kind], **sw)
+        missing = [k for k in REQUIRED[kind] if k not in sw]
+        if kind != "axis":
+            sw.setdefault("name", f"VertSlice{n + 1}")
+        else:
+            sw["axis"] = str(sw.get("axis", "")).lower()
+            sw.setdefault("name", f"Slices_{sw['axis'].upper()}{n + 1}")
+            if sw["keys"] is None:
+                sw["keys"] = list(axis_slices.QUANTITIES)
+        if missing:
+            raise ValueError(f"sweep {n}: missing {', '.join(missing)}")
+        if isinstance(sw["ramp"], str) and sw["ramp"] != GLOBAL:
+            raise ValueError(f"sweep {n}: ramp must be [min, max, interval] or {GLOBAL!r}")
+        out.append(sw)
+    return out
+
+
+# ------------------------------
+# Spec -> plan (vectorized)
+# ------------------------------
+def sweep_planes(sw):
+    """(origins, normals) of every slice of a filled-in sweep, before clipping."""
+    kind = sw["kind"]
+    if kind == "plane":
+        return geometry.linear(sw["origin"], sw["normal"], sw["spacing"], int(sw["count"]),
+                               sw["direction"])
+    if kind == "bidirectional":
+        return geometry.bidirectional(sw["origin"], sw["normal"], sw["spacing"],
+                                      int(sw["back"]), int(sw["forward"]))
+    if kind == "radial":
+        return geometry.radial(sw["origin"], sw["rotation_axis"], sw["normal"],
+                               sw["angle_step"], int(sw["count"]), sw["start_angle"])
+    if kind == "polyline":
+        return geometry.polyline(sw["points"], sw["spacing"])
+    pos = np.asarray(axis_slices.positions(sw["start"], sw["end"], sw["step"]), float)
+    origins = np.zeros((len(pos), 3))
+    origins[:, AXES[sw["axis"]]] = pos
+    normals = np.zeros((len(pos), 3))
+    normals[:, AXES[sw["axis"]]] = 1.0
+    return origins, normals
+
+
+def _expand_sweep(n, sw):
+    origins, normals = sweep_planes(sw)
+    index = np.arange(1, len(origins) + 1)
+    if sw.get("clip"):
+        origins, normals, kept = geometry.clip_to_box(origins, normals, sw["clip"])
+        index = index[kept]
+    rows = np.zeros(len(origins), PLAN_DTYPE)
+    rows["sweep"] = n
+    rows["index"] = index    # slice numbers (file names) stay stable when clipped
+    rows["origin"] = origins
+    rows["normal"] = normals
+    if sw["kind"] == "axis":
+        rows["center"] = rows["eye"] = np.nan
+        rows["roll"] = np.nan
+    else:
+        rows["center"] = sw["center"]
+        rows["eye"] = sw["eye"]
+        rows["roll"] = sw["roll"]
+    rows["ramp"] = np.nan if sw["ramp"] is None or sw["ramp"] == GLOBAL else sw["ramp"]
+    return rows
+
+
+def _target(sw):
+    """What a sweep writes to; planes are duplicates only within the same target."""
+    if sw["kind"] != "axis":
+        return ("camera", os.path.normpath(sw["out_dir"]))
+    return ("axis", os.path.normpath(sw["base_dir"]), tuple(sw["keys"]), sw["dpi"],
+            sw["outline"], sw["name_format"])
+
+
+def expand(spec, dedupe=True, zones=None):
+    """
+    Expand 'spec' into (plan, sweeps): a PLAN_DTYPE array with one record
+    per slice, in sweep order, and the filled-in sweep list it indexes.
+    With 'dedupe', slices repeating an earlier one (same output target,
+    plane, camera and ramp, to 1e-6) are dropped; with 'zones' (an
+    extent.ZoneIndex), slices cutting no zone are dropped and logged.
+    """
+    sws = sweeps(spec)
+    if not sws:
+        return np.zeros(0, PLAN_DTYPE), sws
+    plan = np.concatenate([_expand_sweep(n, sw) for n, sw in enumerate(sws)])
+    if dedupe and len(plan):
+        targets = {}
+        group = np.array([targets.setdefault(_target(sw), len(targets)) for sw in sws])
+        key = np.column_stack([group[plan["sweep"]], plan["origin"], plan["normal"],
+                               plan["center"], plan["eye"], plan["roll"], plan["ramp"]])
+        key = np.nan_to_num(np.round(key, 6), nan=np.inf)
+        _, first = np.unique(key, axis=0, return_index=True)
+        plan = plan[np.sort(first)]
+    if zones is not None and len(plan):
+        hit = zones.hits(plan["origin"], plan["normal"])
+        for n in np.unique(plan["sweep"][~hit]):
+            missed = plan[~hit & (plan["sweep"] == n)]
+            if sws[n]["kind"] == "axis":   # log positions, slice numbers otherwise
+                labels = [_number(v) for v in missed["origin"][:, AXES[sws[n]["axis"]]]]
+            else:
+                labels = missed["index"].tolist()
+            report_skipped(f"sweep {n + 1} ({sws[n]['name']})", labels)
+        plan = plan[hit]
+    return plan, sws
+
+
+def global_sweeps(sws):
+    """Indices of the sweeps asking for ramp = "global"."""
+    return [n for n, sw in enumerate(sws) if sw["ramp"] == GLOBAL]
+
+
+def apply_global_ramps(plan, sws, mesh, index=None):
+    """
+    Resolve ramp = "global" from 'mesh' (a section.ZoneMesh, 'index' its
+    ZoneIndex) over the zones each sweep's planes in 'plan' cut. Camera
+    sweeps get the ramp in their plan records; axis sweeps keep one ramp
+    per quantity in sw["ramps"]. Returns the updated plan.
+    """
+    for n in global_sweeps(sws):
+        sw = sws[n]
+        sel = plan["sweep"] == n
+        keys = sw["keys"] if sw["kind"] == "axis" else ["max"]
+        found = ramps.global_ramps(mesh, keys, plan["origin"][sel], plan["normal"][sel],
+                                   sw.get("ramp_percentiles"),
+                                   sw.get("ramp_bands", ramps.DEFAULT_BANDS), index)
+        ramps.report_ramps(f"sweep {n + 1} ({sw['name']})", found)
+        if sw["kind"] == "axis":
+            sw["ramps"] = found
+        elif "max" in found:
+            plan["ramp"][sel] = found["max"]
+    return plan
+
+
+# ------------------------------
+# Plan -> jobs
+# ------------------------------
+def _number(x):
+    x = float(x)
+    return int(x) if x.is_integer() else x
+
+
+def plan_jobs(plan, sws, fmt="bmp", background=False, reuse_plot=True):
+    """Job dicts (see slicekit.jobs) rendering the records of 'plan' in order."""
+    jobs = []
+    for n, row in enumerate(plan):
+        sw = sws[row["sweep"]]
+        ramp = None if np.isnan(row["ramp"]).any() else tuple(_number(v) for v in row["ramp"])
+        index = int(row["index"])
+        if sw["kind"] != "axis":
+            plot = sw["name"] if reuse_plot else f"{sw['name']}_{index:03d}"
+            jobs.append(sweep.slice_job(sw["out_dir"], index, row["origin"],
+                                        row["normal"], ramp or axis_slices.RAMP_AUTO,
+                                        tuple(sw["center"]),
+                                        tuple(sw["eye"]), sw["roll"], sw["dpi"], plot,
+                                        fmt, background))
+            continue
+        axis = sw["axis"]
+        pos = _number(row["origin"][AXES[axis]])
+        keys = sw["keys"] if n % 2 == 0 else sw["keys"][::-1]
+        for key in keys:
+            plot = sw["name"] if reuse_plot else f"{sw['name']}_{key}{pos}"
+            jobs.append(axis_slices.slice_job(key, axis, pos, plot, sw["base_dir"], sw["dpi"],
+                                              fmt, background,
+                                              ramp or sw.get("ramps", {}).get(key),
+                                              sw["outline"], sw["name_format"]))
+    return jobs
+
+
+def spec_jobs(spec, make_dirs=True, mesh=None, zones=None):
+    """
+    All jobs of 'spec' (a dict or a spec file path), output folders
+    created. Global ramps are resolved from 'mesh' (a section.ZoneMesh,
+    e.g. a snapshot's); without it they fall back to "automatic". With
+    'zones' (an extent.ZoneIndex) and the run option skip_empty, planes
+    cutting no zone are dropped.
+    """
+    if isinstance(spec, str):
+        spec = load_spec(spec)
+    run = dict(RUN_DEFAULTS, **spec.get("run", {}))
+    plan, sws = expand(spec, zones=zones if run["skip_empty"] else None)
+    if mesh is not None:
+        plan = apply_global_ramps(plan, sws, mesh)
+    elif global_sweeps(sws):
+        print('ramp = "global" needs the model; those sweeps use automatic ramps')
+    jobs = plan_jobs(plan, sws, run["format"], run["background"], run["reuse_plot"])
+    if make_dirs:
+        for d in set(os.path.dirname(job["output"]) for job in jobs):
+            os.makedirs(d or ".", exist_ok=True)
+    return jobs
+
+
+# ------------------------------
+# Running inside FLAC3D
+# ------------------------------
+def run_spec(it, spec, benchmark=False):
+    """
+    Render every sweep of 'spec' (a dict or a spec file path) in 'it',
+    following its [run] options. Returns the number of images rendered.
+    """
+    from slicekit.batch import run_batched
+    from slicekit.jobs import ManifestSet, image_hooks, run_jobs
+    from slicekit.raster import RasterWriter
+    from slicekit.section import ZoneMesh
+    from slicekit.stream import VideoStream
+
+    if isinstance(spec, str):
+        spec = load_spec(spec)
+    run = dict(RUN_DEFAULTS, **spec.get("run", {}))
+    mesh = None
+    if run["rasters"] or global_sweeps(sweeps(spec)):
+        mesh = ZoneMesh.from_model(it)             # one bulk read, shared below
+    # planes are checked against every zone, not only the mesh's bricks
+    zones = ZoneIndex.from_model(it) if run["skip_empty"] else None
+    plan, sws = expand(spec, zones=zones)
+    if mesh is not None:
+        plan = apply_global_ramps(plan, sws, mesh)
+    manifests = ManifestSet(it)
+    rasters = RasterWriter(it, mesh=mesh) if run["rasters"] else None
+    rendered = 0
+    for n, sw in enumerate(sws):
+        jobs = plan_jobs(plan[plan["sweep"] == n], sws, run["format"], run["background"],
+                         run["reuse_plot"])
+        if not jobs:
+            continue
+        for d in set(os.path.dirname(job["output"]) for job in jobs):
+            os.makedirs(d or ".", exist_ok=True)
+        label = sw.get("out_dir") or f"{sw['axis']} slices"
+
+        stream = None
+        if sw.get("video", run["video"]) and sw["kind"] != "axis":
+            stream = VideoStream(jobs, os.path.join(sw["out_dir"], "video_slices.mp4"),
+                                 run["video_fps"], keep=run["keep_frames"],
+                                 python=run["video_python"])
+        on_image = image_hooks(rasters, stream)
+        if run["compile"]:
+            _, skipped = run_batched(it, jobs, run["batch_size"], resume=run["resume"],
+                                     benchmark=benchmark, manifests=manifests, label=label,
+                                     on_image=on_image)
+        else:
+            _, skipped = run_jobs(it, jobs, resume=run["resume"], benchmark=benchmark,
+                                  manifests=manifests, label=label, on_image=on_image)
+        if stream is not None:
+            stream.close()
+        rendered += len(jobs) - skipped
+        print(f"\n Export complete! Files saved in: {label}\n")
+    return rendered
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Expand a sweep spec and summarise the plan.")
+    ap.add_argument("spec", help=".toml or .yaml sweep specification")
+    ap.add_argument("--no-dedupe", action="store_true")
+    args = ap.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    t0 = time.perf_counter()
+    plan, sws = expand(spec, dedupe=not args.no_dedupe)
+    t_expand = time.perf_counter() - t0
+    total = 0
+    for n, sw in enumerate(sws):
+        planes = len(sweep_planes(sw)[0])
+        count = int((plan["sweep"] == n).sum())
+        total += planes
+        where = sw.get("out_dir") or f"{sw['axis']} {sw['start']}..{sw['end']} {sw['keys']}"
+        print(f"  sweep {n + 1} ({sw['kind']}): {count} of {planes} planes -> {where}")
+    print(f"{len(plan)} planes ({total - len(plan)} clipped or duplicate) "
+          f"expanded in {t_expand * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ====================================================================
+# slicekit/stream.py
+# --------------------------------------------------------------------
+# Encodes a sweep into video while it renders. VideoStream starts a
+# 'python -m slicekit.video stream' encoder process and is passed to
+# run_jobs/run_batched as on_image: every finished (or already current)
+# frame of the plan is sent to the encoder, which decodes it once and
+# can delete it straight away, so the video is done when the last slice
+# is and only a few frames are on disk at any time. Frames whose
+# conversion failed are sent as skipped, so later ones are not held.
+#
+# The encoder needs OpenCV (and ffmpeg for H.264/H.265); when FLAC3D's
+# Python lacks them, point 'python' at an interpreter that has them.
+# ====================================================================
+
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class VideoStream:
+    """
+    Encoder process for the frames of 'jobs' (in plan order) into 'output'.
+    Call it with each finished job; close() waits for the video.
+    With keep=False each image is deleted once the encoder has read it.
+    """
+
+    def __init__(self, jobs, output, fps=5, keep=True, python=None, encoder="auto",
+                 codec="h264", crf=20, preset="medium", width=None, height=None):
+        self.index = {os.path.abspath(job["output"]): n for n, job in enumerate(jobs)}
+        self.output = output
+        cmd = [python or sys.executable, "-m", "slicekit.video", "stream", output,
+               "--fps", str(fps), "--encoder", encoder, "--codec", codec,
+               "--crf", str(crf), "--preset", preset]
+        if width:
+            cmd += ["--width", str(width)]
+        if height:
+            cmd += ["--height", str(height)]
+        if not keep:
+            cmd.append("--delete")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([REPO_ROOT, os.environ.get("PYTHONPATH", "")]))
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, env=env,
+                                     stdout=subprocess.DEVNULL, text=True)
+
+    def __call__(self, job):
+        if job.get("failed"):
+            self.skip(job["output"])
+        else:
+            self.add(job["output"])
+
+    def add(self, path):
+        """Send the image 'path' to the encoder; paths outside the plan are ignored."""
+        self._send(path)
+
+    def skip(self, path):
+        """Tell the encoder the frame 'path' will not come, so it encodes past it."""
+        self._send(path, skip=True)
+
+    def _send(self, path, skip=False):
+        path = os.path.abspath(path)
+        n = self.index.get(path)
+        if n is None:
+            return
+        if self.proc.poll() is not None:
+            raise RuntimeError(f"video encoder exited with code {self.proc.returncode}")
+        self.proc.stdin.write(f"{n}\t{'' if skip else path}\n")
+        self.proc.stdin.flush()
+
+    def close(self):
+        """Finish the video once every sent frame is encoded."""
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"video encoder exited with code {self.proc.returncode}")
+        print(f"Video saved as: {self.output}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,167 @@
+# ====================================================================
+# slicekit/stub/itasca.py
+# --------------------------------------------------------------------
+# Stand-in for FLAC3D's itasca module so slice plans can be run, timed
+# and compared without a licence. Commands are recorded, not executed;
+# 'plot export bitmap' sleeps for a simulated render time and writes a
+# 1x1 white BMP to the requested path, 'model restore' sleeps for a
+# simulated restore time and 'program call "file.dat"' runs the file's
+# contents through command() as FLAC3D would.
+#
+#   SLICEKIT_STUB_LATENCY   seconds per exported image   (default 0.05)
+#   SLICEKIT_STUB_RESTORE   seconds per model restore    (default 0.5)
+#   SLICEKIT_STUB_MESH      "xmin,ymin,zmin,xmax,ymax,zmax,nx,ny,nz": a
+#                           block of nx*ny*nz hex zones (default: none)
+#                           under lithostatic stress, also exposed through
+#                           the gridpointarray/zonearray bulk accessors
+# ====================================================================
+
+import os
+import re
+import struct
+import time
+
+RENDER_LATENCY = float(os.environ.get("SLICEKIT_STUB_LATENCY", "0.05"))
+RESTORE_LATENCY = float(os.environ.get("SLICEKIT_STUB_RESTORE", "0.5"))
+
+commands = []   # every string passed to command(), in order
+
+_EXPORT = re.compile(r'plot export bitmap filename="([^"]+)"')
+_RESTORE = re.compile(r"^\s*model restore\b", re.MULTILINE)
+_CALL = re.compile(r'^\s*program call "([^"]+\.dat)"', re.MULTILINE)
+
+
+def _white_bmp():
+    pixel = b"\xff\xff\xff\x00"   # one BGR pixel padded to 4 bytes
+    dib = struct.pack("<IiiHHIIiiII", 40, 1, 1, 1, 24, 0, len(pixel), 2835, 2835, 0, 0)
+    header = struct.pack("<2sIHHI", b"BM", 14 + len(dib) + len(pixel), 0, 0, 14 + len(dib))
+    return header + dib + pixel
+
+
+def command(text):
+    commands.append(text)
+    if _RESTORE.search(text):
+        time.sleep(RESTORE_LATENCY)
+    for path in _EXPORT.findall(text):
+        time.sleep(RENDER_LATENCY)
+        with open(path, "wb") as f:
+            f.write(_white_bmp())
+    for path in _CALL.findall(text):
+        with open(path, "r", encoding="utf-8") as f:
+            command(f.read())
+
+
+class _Gridpoint:
+    def __init__(self, index, pos):
+        self._index = index
+        self._pos = pos
+
+    def id(self):
+        return self._index + 1
+
+    def pos(self):
+        return self._pos
+
+    def disp(self):
+        return (0.0, 0.0, 0.0)
+
+
+class _Zone:
+    def __init__(self, gridpoints, top):
+        self._gridpoints = gridpoints
+        self._top = top
+
+    def gridpoints(self):
+        return self._gridpoints
+
+    def model(self):
+        return "elastic"
+
+    def pos(self):
+        return tuple(sum(gp.pos()[a] for gp in self._gridpoints) / 8 for a in range(3))
+
+    def stress(self):
+        szz = -25000.0 * (self._top - self.pos()[2])    # compression negative
+        return ((0.5 * szz, 0.0, 0.0), (0.0, 0.5 * szz, 0.0), (0.0, 0.0, szz))
+
+    def pp(self):
+        return 0.0
+
+    def state(self):
+        return 0
+
+
+class _Objects:
+    def __init__(self, objects):
+        self._objects = objects
+
+    def count(self):
+        return len(self._objects)
+
+    def list(self):
+        return iter(self._objects)
+
+
+def _hex_block(spec):
+    """Gridpoints and zones of a regular block; spec as SLICEKIT_STUB_MESH."""
+    if not spec:
+        return [], []
+    v = [float(x) for x in spec.split(",")]
+    lo, hi, n = v[0:3], v[3:6], [int(x) for x in v[6:9]]
+    coord = [[lo[a] + (hi[a] - lo[a]) * k / n[a] for k in range(n[a] + 1)] for a in range(3)]
+    gps = {}
+    for i in range(n[0] + 1):
+        for j in range(n[1] + 1):
+            for k in range(n[2] + 1):
+                gps[i, j, k] = _Gridpoint(len(gps), (coord[0][i], coord[1][j], coord[2][k]))
+    zones = []
+    for i in range(n[0]):
+        for j in range(n[1]):
+            for k in range(n[2]):
+                # FLAC3D brick gridpoint order
+                corners = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1),
+                           (1, 1, 0), (0, 1, 1), (1, 0, 1), (1, 1, 1)]
+                zones.append(_Zone([gps[i + a, j + b, k + c] for a, b, c in corners], hi[2]))
+    return list(gps.values()), zones
+
+
+_gridpoints, _zones = _hex_block(os.environ.get("SLICEKIT_STUB_MESH", ""))
+zone = _Objects(_zones)
+gridpoint = _Objects(_gridpoints)
+
+
+class _GridpointArray:
+    def pos(self):
+        import numpy as np
+        return np.array([gp.pos() for gp in _gridpoints], dtype=float).reshape(-1, 3)
+
+    def disp(self):
+        import numpy as np
+        return np.zeros((len(_gridpoints), 3))
+
+
+class _ZoneArray:
+    def gridpoints(self):
+        import numpy as np
+        return np.array([[gp._index for gp in z.gridpoints()] for z in _zones],
+                        dtype=np.int64).reshape(-1, 8)
+
+    def stress(self):
+        import numpy as np
+        return np.array([z.stress() for z in _zones], dtype=float).reshape(-1, 3, 3)
+
+    def pp(self):
+        import numpy as np
+        return np.zeros(len(_zones))
+
+    def live_mechanical(self):
+        import numpy as np
+        return np.array([z.model() != "null" for z in _zones], dtype=bool)
+
+    def state(self, current=True):
+        import numpy as np
+        return np.array([z.state() for z in _zones], dtype=np.int32)
+
+
+gridpointarray = _GridpointArray()
+zonearray = _ZoneArray()
@@ -0,0 +1,129 @@
+# ====================================================================
+# slicekit/sweep.py
+# --------------------------------------------------------------------
+# Slice plans for the slab-review-code vertical sweeps: planes with a
+# fixed (usually oblique) normal, offset from a base origin at a fixed
+# spacing, rendered with a fixed camera and contour ramp and written as
+# vert_slice_NNN.bmp.
+# ====================================================================
+
+import os
+
+from slicekit import geometry
+from slicekit.commands import cut_command, export_command, vec
+from slicekit.extent import report_skipped
+from slicekit.images import output_paths
+
+
+def create_command(name, origin, normal, ramp, center, eye, roll):
+    """Create the vertical slice plot: legend, fixed camera and cut zone item."""
+    min_val, max_val, interval = ramp
+    return f"""
+        plot create "{name}"
+        plot clear
+        plot active on
+        plot target active on
+        plot background 'white'
+        plot outline active on width 2 color 'black'
+
+        plot legend active true heading size 80 color 'black' copyright size 28 color 'black' ...
+            placement left size 25,50 ...
+            step active false ...
+            time-real active false ...
+            time-model active false ...
+            title-customer active false ...
+            view-info active false
+
+        plot title-job active false
+        plot title active false
+
+        plot view projection parallel magnification 1 ...
+            center ({center[0]},{center[1]},{center[2]}) ...
+            eye ({eye[0]},{eye[1]},{eye[2]}) ...
+            roll {roll} ...
+            clip-front -1e10 clip-back 1e10
+
+        plot item create zone active on ...
+            contour stress-effective quantity maximum log off ...
+                method average null fluid off mechanical on thermal off ...
+            ramp rainbow ...
+                minimum {min_val} maximum {max_val} interval {interval} ...
+                reversed off above automatic below automatic ...
+            polygons fill on outline active off ...
+                polygon-transparency 0 ...
+                outline-transparency 80 lighting on offset 0.5 2 ...
+            cut-line width 1 selected-only false selected-highlight false selected-only false ...
+            null-faces-only off ...
+            map axis xyz rotate (0,0,0) translate (0,0,0) scale (1,1,1) ...
+            deformation-factor active off ...
+            hide-null mechanical on thermal off fluid off ...
+            transparency 0 ...
+            cut active on type plane ...
+                 surface on front off back off ...
+                 origin {origin} ...
+                 normal {normal} ...
+            clip active off ...
+            legend active on ...
+                title active true text "" size 55 family 'Times New Roman' style bold color 'black' ...
+                cut ...
+                    title active true size 44 family 'Arial' style normal color 'black' ...
+                    origin active false ...
+                    normal active false ...
+                    orientation active false ...
+                map active true size 44 family 'Arial' style normal color 'black' ...
+                hide-null active false ...
+                deformation-factor active true size 44 family 'Arial' style normal color 'black' ...
+                count active false ...
+                contour labels active true size 44 family 'Arial' style normal color 'black' ...
+                labels-maximum 20  format 0  precision 2 ...
+                method active true size 44 family 'Arial' style normal color 'black'
+    """
+
+
+def slice_job(out_dir, index, origin, normal, ramp, center, eye, roll, dpi=300,
+              plot="VertSlice", fmt="bmp", background=False):
+    """Job writing vert_slice_<index>.<fmt> for the plane through 'origin'."""
+    origin = tuple(float(c) for c in origin)
+    normal = tuple(float(c) for c in normal)
+    origin_s = vec(origin, ".3f")
+    normal_s = vec(normal, ".6f")
+    filename, raw = output_paths(os.path.join(out_dir, f"vert_slice_{index:03d}"),
+                                 fmt, background)
+    return {
+        "output": filename,
+        "raw": raw,
+        "manifest": os.path.join(out_dir, "manifest.json"),
+        "params": {"index": index, "origin": [round(c, 3) for c in origin],
+                   "normal": list(normal), "ramp": list(ramp),
+                   "view": [list(center), list(eye), roll], "dpi": dpi},
+        "plot": plot,
+        "plane": origin_s,
+        "quantity": "max",
+        "create": create_command(plot, origin_s, normal_s, ramp, center, eye, roll),
+        "cut": cut_command(origin_s, normal_s),
+        "colorby": None,
+        "export": export_command(raw or filename, dpi),
+        "label": f"Exporting vertical slice at origin {origin}",
+    }
+
+
+def plan(out_dir, origin_base, normal, spacing, num_slices, direction=1,
+         ramp=(0, 100000, 50), center=None, eye=None, roll=0, dpi=300,
+         name="VertSlice", reuse_plot=True, fmt="bmp", background=False, zones=None):
+    """
+    Jobs for 'num_slices' planes starting at 'origin_base' and stepping
+    'spacing' along direction * 'normal' (see geometry.linear; slicekit.spec
+    covers the other sweep shapes).
+
+    With reuse_plot one plot is built and only its cut moves between
+    slices; otherwise every slice gets its own plot as the original
+    scripts did. 'fmt' and 'background' choose the image format as in
+    images.output_paths(). With 'zones' (an extent.ZoneIndex) slices that
+    cut no zone are left out and logged; the others keep their numbers.
+    """
+    origins, _ = geometry.linear(origin_base, normal, spacing, num_slices, direction)
+    hit = [True] * len(origins) if zones is None else zones.hits(origins, normal)
+    report_skipped(out_dir, [i + 1 for i, h in enumerate(hit) if not h])
+    return [slice_job(out_dir, i + 1, origin, normal, ramp, center, eye, roll, dpi,
+                      name if reuse_plot else f"{name}_{i+1:03d}", fmt, background)
+            for i, origin in enumerate(origins) if hit[i]]
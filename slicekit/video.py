@@ -0,0 +1,439 @@
+# ====================================================================
+# slicekit/video.py
+# --------------------------------------------------------------------
+# Frame sequence -> video encoding, used by the video-generator scripts
+# and as a command-line tool:
+#
+#   python -m slicekit.video make ./exports/max_principal/zslice \
+#       -o ./exports/max_principal/zslice/video_slices.mp4 -o preview.gif@480
+#   python -m slicekit.video make ./exports/rotation_z --recursive --stride 2 \
+#       --start 10 --end 40 --fps 1 -o ./exports/rotation_z/video.mp4
+#   python -m slicekit.video make "./exports/**/vert_slice_*.bmp" -o sweep.mp4
+#
+# Inputs are folders (with --recursive, their subfolders too) or glob
+# patterns, naturally sorted. Every output (MP4 or GIF, each at its own
+# width) is fed from one decode pass.
+#
+# Frames are decoded by a small thread pool into a bounded, ordered
+# queue while the encoder consumes them, so decode and encode overlap.
+# Encoding pipes raw BGR frames to an ffmpeg subprocess (H.264/H.265
+# with CRF/preset) and falls back to OpenCV's mp4v VideoWriter when
+# ffmpeg is not on the PATH.
+#
+# Frames can be encoded at a smaller target size: the JPEG/PNG/BMP
+# decoder is asked for a 1/2, 1/4 or 1/8 image directly
+# (IMREAD_REDUCED_COLOR_*) and only the remainder is area-resampled.
+# Frames whose size differs from the video's are padded or resized.
+#
+# 'stream' mode encodes frames while an export is still running: it
+# reads "index<TAB>path" lines on stdin (see slicekit.stream), encodes
+# them in index order and can delete each image once decoded; an empty
+# path marks a frame that will not come (its conversion failed):
+#
+#   python -m slicekit.video stream out.mp4 --fps 10 --delete < frames.txt
+# ====================================================================
+
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import cv2
+import natsort
+
+from slicekit.images import IMAGE_EXTENSIONS
+
+CODECS = {"h264": "libx264", "h265": "libx265"}
+REDUCED_READ = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4,
+                8: cv2.IMREAD_REDUCED_COLOR_8}
+PAD_COLOR = (255, 255, 255)   # slice exports have a white background
+
+
+# ------------------------------
+# Decoding and frame size
+# ------------------------------
+def read_frame(path, reduce=1, delete=False):
+    """
+    cv2.imread at 1/reduce of the stored size (reduce in 1, 2, 4, 8),
+    removing the file afterwards when 'delete' is set and it was readable.
+    """
+    if reduce in REDUCED_READ:
+        frame = cv2.imread(path, REDUCED_READ[reduce])
+    else:
+        frame = cv2.imread(path, cv2.IMREAD_COLOR)
+    if delete and frame is not None:
+        os.remove(path)
+    return frame
+
+
+def target_size(src_size, width=None, height=None, scale=None):
+    """
+    Output (width, height) for frames of 'src_size'. Give a width and/or
+    height (a missing one keeps the aspect ratio) or a scale factor; with
+    none of them the source size is kept.
+    """
+    w, h = src_size
+    if scale:
+        return max(1, round(w * scale)), max(1, round(h * scale))
+    if width and height:
+        return width, height
+    if width:
+        return width, max(1, round(h * width / w))
+    if height:
+        return max(1, round(w * height / h)), height
+    return w, h
+
+
+def reduction_for(src_size, size):
+    """Largest reduced-decode factor that still yields at least 'size' pixels."""
+    for factor in (8, 4, 2):
+        if src_size[0] // factor >= size[0] and src_size[1] // factor >= size[1]:
+            return factor
+    return 1
+
+
+def fit_frame(frame, size, mode="pad"):
+    """
+    Return 'frame' at exactly 'size' (width, height). "pad" scales it to fit
+    while keeping its aspect ratio and pads the rest white; "resize"
+    stretches it. Shrinking uses area resampling.
+    """
+    h, w = frame.shape[:2]
+    if (w, h) == tuple(size):
+        return frame
+    tw, th = size
+    if mode == "resize":
+        interp = cv2.INTER_AREA if tw < w or th < h else cv2.INTER_LINEAR
+        return cv2.resize(frame, (tw, th), interpolation=interp)
+    s = min(tw / w, th / h)
+    nw, nh = max(1, min(tw, round(w * s))), max(1, min(th, round(h * s)))
+    if (nw, nh) != (w, h):
+        frame = cv2.resize(frame, (nw, nh),
+                           interpolation=cv2.INTER_AREA if s < 1 else cv2.INTER_LINEAR)
+    top, left = (th - nh) // 2, (tw - nw) // 2
+    return cv2.copyMakeBorder(frame, top, th - nh - top, left, tw - nw - left,
+                              cv2.BORDER_CONSTANT, value=PAD_COLOR)
+
+
+def iter_frames(paths, workers=4, prefetch=16, reduce=1, delete=False):
+    """
+    Yield (path, frame) for 'paths' in order, decoding up to 'prefetch'
+    frames ahead on 'workers' threads (cv2.imread releases the GIL) at
+    1/reduce of their stored size. Unreadable images yield frame None.
+    'paths' may be a lazy iterable; each image is read as soon as its
+    path arrives.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append((path, pool.submit(read_frame, path, reduce, delete)))
+            if len(pending) >= prefetch:
+                p, future = pending.popleft()
+                yield p, future.result()
+        while pending:
+            p, future = pending.popleft()
+            yield p, future.result()
+
+
+# ------------------------------
+# Encoders
+# ------------------------------
+class FFmpegWriter:
+    """Pipes raw BGR frames of a fixed size into an ffmpeg encode."""
+
+    def __init__(self, output, fps, size, codec="h264", crf=20, preset="medium",
+                 ffmpeg="ffmpeg"):
+        width, height = size
+        cmd = [ffmpeg, "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}",
+               "-r", str(fps), "-i", "-",
+               # yuv420p needs even dimensions
+               "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2:color=white",
+               "-c:v", CODECS.get(codec, codec), "-crf", str(crf), "-preset", preset,
+               "-pix_fmt", "yuv420p"]
+        if codec == "h265":
+            cmd += ["-tag:v", "hvc1"]   # playable in QuickTime/PowerPoint
+        cmd.append(output)
+        self.size = size
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self.proc.stdin.write(frame.tobytes())
+
+    def close(self):
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self.proc.returncode}")
+
+
+class OpenCVWriter:
+    """cv2.VideoWriter with the mp4v codec (no ffmpeg needed)."""
+
+    def __init__(self, output, fps, size):
+        self.output = output
+        self.size = size
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.writer = cv2.VideoWriter(output, fourcc, fps, size)
+        if not self.writer.isOpened():
+            raise RuntimeError(f"OpenCV cannot write {output} at {size[0]}x{size[1]} "
+                               f"(try encoder='ffmpeg' or a larger target size)")
+
+    def write(self, frame):
+        self.writer.write(frame)
+
+    def close(self):
+        self.writer.release()
+        if not os.path.exists(self.output) or os.path.getsize(self.output) == 0:
+            raise RuntimeError(f"OpenCV did not write {self.output}")
+
+
+class GifWriter:
+    """Animated GIF via Pillow, for small previews (frames are kept in memory)."""
+
+    def __init__(self, output, fps, size):
+        from PIL import Image
+        self.output = output
+        self.size = size
+        self.duration = round(1000 / fps)
+        self.frames = []
+        self._image = Image
+
+    def write(self, frame):
+        rgb = self._image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        self.frames.append(rgb.convert("P", palette=self._image.ADAPTIVE))
+
+    def close(self):
+        if self.frames:
+            self.frames[0].save(self.output, save_all=True, append_images=self.frames[1:],
+                                duration=self.duration, loop=0, optimize=True)
+        self.frames = []
+
+
+def open_writer(output, fps, size, encoder="auto", codec="h264", crf=20, preset="medium"):
+    """
+    Video writer for frames of 'size' (width, height). A .gif output gets a
+    GifWriter; otherwise encoder is "ffmpeg", "opencv" or "auto" (ffmpeg
+    when found on the PATH, else OpenCV).
+    """
+    if output.lower().endswith(".gif"):
+        return GifWriter(output, fps, size)
+    ffmpeg = shutil.which("ffmpeg")
+    if encoder == "ffmpeg" and not ffmpeg:
+        raise FileNotFoundError("ffmpeg not found on PATH")
+    if encoder in ("auto", "ffmpeg") and ffmpeg:
+        return FFmpegWriter(output, fps, size, codec, crf, preset, ffmpeg)
+    if encoder == "auto":
+        print("ffmpeg not found; falling back to OpenCV mp4v")
+    return OpenCVWriter(output, fps, size)
+
+
+# ------------------------------
+# Frame selection
+# ------------------------------
+def collect_frames(inputs, recursive=False, extensions=IMAGE_EXTENSIONS):
+    """
+    Image paths for 'inputs' (folders or glob patterns, '**' allowed), in
+    input order and naturally sorted within each input (slice_2 before
+    slice_10, subfolder 02 before 10). Folders matched by a pattern are
+    searched like folders given directly.
+    """
+    def in_folder(folder):
+        found = []
+        for root, dirs, files in os.walk(folder):
+            found.extend(os.path.join(root, f) for f in files
+                         if f.lower().endswith(extensions))
+            if not recursive:
+                break
+        return found
+
+    paths = []
+    for spec in inputs:
+        if os.path.isdir(spec):
+            found = in_folder(spec)
+        else:
+            found = []
+            for match in glob.glob(spec, recursive=True):
+                if os.path.isdir(match):
+                    found.extend(in_folder(match))
+                elif match.lower().endswith(extensions):
+                    found.append(match)
+            found = list(dict.fromkeys(found))     # '**' can match nested folders twice
+        paths.extend(natsort.natsorted(found, alg=natsort.ns.PATH))
+    return paths
+
+
+def select_frames(paths, stride=1, start=None, end=None, fps=5):
+    """
+    Frames between 'start' and 'end' seconds (of the sequence played at
+    'fps'), then every 'stride'-th of those.
+    """
+    first = int(round(start * fps)) if start else 0
+    last = int(round(end * fps)) if end is not None else None
+    return paths[first:last][::max(1, stride)]
+
+
+def parse_output(spec):
+    """'video.mp4' or 'preview.gif@480' (width in pixels) -> output dict."""
+    path, _, width = spec.rpartition("@")
+    if not path or not width.isdigit():
+        return {"output": spec}
+    return {"output": path, "width": int(width)}
+
+
+# ------------------------------
+# Frames -> video
+# ------------------------------
+def make_videos(paths, outputs, fps=5, encoder="auto", codec="h264", crf=20,
+                preset="medium", workers=4, prefetch=16, fit="pad", delete=False):
+    """
+    Encode the images 'paths' (in order, any iterable) into every output
+    in 'outputs' from a single decode pass. Each output is a dict with
+    "output" and optional "width"/"height"/"scale" (see target_size).
+
+    Output sizes are fixed by the first readable image; frames are decoded
+    already reduced where every output allows it. Frames of another size
+    are fitted with fit_frame ("pad" or "resize"), or skipped with
+    fit="skip". Unreadable images are skipped, and each image is deleted
+    once decoded when 'delete' is set. Returns frames written.
+    """
+    paths = iter(paths)
+    # the first readable frame, at full size, fixes the source and target sizes
+    first = None
+    for first_path in paths:
+        first = read_frame(first_path, delete=delete)
+        if first is not None:
+            break
+        print(f"⚠️ Skipping unreadable image: {os.path.basename(first_path)}")
+    if first is None:
+        raise RuntimeError("No readable images to encode")
+    src_size = (first.shape[1], first.shape[0])
+    sizes = [target_size(src_size, out.get("width"), out.get("height"), out.get("scale"))
+             for out in outputs]
+    reduce = min(reduction_for(src_size, size) for size in sizes)
+    if reduce > 1:
+        print(f"Decoding at 1/{reduce} of {src_size[0]}x{src_size[1]}")
+
+    writers = [open_writer(out["output"], fps, size, encoder, codec, crf, preset)
+               for out, size in zip(outputs, sizes)]
+    mode = "pad" if fit == "skip" else fit
+    written = 0
+    frames = chain([(first_path, first)],
+                   iter_frames(paths, workers, prefetch, reduce, delete))
+    for path, frame in frames:
+        name = os.path.basename(path)
+        if frame is None:
+            print(f"⚠️ Skipping unreadable image: {name}")
+            continue
+        h, w = frame.shape[:2]
+        if fit == "skip" and (abs(w * reduce - src_size[0]) >= reduce or
+                              abs(h * reduce - src_size[1]) >= reduce):
+            print(f"⚠️ Skipping {name}: size differs from {src_size[0]}x{src_size[1]}")
+            continue
+        for writer in writers:
+            writer.write(fit_frame(frame, writer.size, mode))
+        written += 1
+        print(f"Added {name}")
+    for writer in writers:
+        writer.close()
+    return written
+
+
+def make_video(paths, output, fps=5, encoder="auto", codec="h264", crf=20,
+               preset="medium", workers=4, prefetch=16,
+               width=None, height=None, scale=None, fit="pad", delete=False):
+    """
+    Encode the images 'paths' into the single video 'output', optionally
+    at a target width/height/scale; see make_videos.
+    """
+    out = {"output": output, "width": width, "height": height, "scale": scale}
+    return make_videos(paths, [out], fps, encoder, codec, crf, preset,
+                       workers, prefetch, fit, delete)
+
+
+# ------------------------------
+# Streaming from a running export
+# ------------------------------
+def ordered_stream(lines):
+    """
+    Yield paths from "index<TAB>path" lines in index order, holding back
+    frames that arrive early. An empty path skips its index; indices never
+    received are skipped at the end.
+    """
+    held = {}
+    nxt = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        index, path = line.rstrip("\r\n").split("\t", 1)
+        held[int(index)] = path
+        while nxt in held:
+            path = held.pop(nxt)
+            if path:
+                yield path
+            nxt += 1
+    for index in sorted(held):
+        if held[index]:
+            yield held[index]
+
+
+def _add_encoder_arguments(p):
+    p.add_argument("--fps", type=float, default=5)
+    p.add_argument("--encoder", default="auto", choices=("auto", "ffmpeg", "opencv"))
+    p.add_argument("--codec", default="h264", choices=tuple(CODECS))
+    p.add_argument("--crf", type=int, default=20)
+    p.add_argument("--preset", default="medium")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Encode slice images into videos.")
+    sub = ap.add_subparsers(dest="mode", required=True)
+
+    mk = sub.add_parser("make", help="encode image folders or glob patterns")
+    mk.add_argument("inputs", nargs="+", help="folders or glob patterns ('**' allowed)")
+    mk.add_argument("-o", "--output", action="append", required=True,
+                    help="video or .gif to write, optionally PATH@WIDTH; repeatable")
+    mk.add_argument("--recursive", action="store_true", help="include subfolders of folder inputs")
+    mk.add_argument("--stride", type=int, default=1, help="use every Nth image")
+    mk.add_argument("--start", type=float, help="start time in seconds (at --fps, before --stride)")
+    mk.add_argument("--end", type=float, help="end time in seconds (at --fps, before --stride)")
+    mk.add_argument("--fit", default="pad", choices=("pad", "resize", "skip"))
+    mk.add_argument("--threads", type=int, default=4, help="decode threads")
+    _add_encoder_arguments(mk)
+
+    st = sub.add_parser("stream", help='read "index<TAB>path" lines from stdin')
+    st.add_argument("output")
+    st.add_argument("--width", type=int)
+    st.add_argument("--height", type=int)
+    st.add_argument("--delete", action="store_true", help="remove each image once decoded")
+    _add_encoder_arguments(st)
+    args = ap.parse_args(argv)
+
+    if args.mode == "make":
+        paths = select_frames(collect_frames(args.inputs, args.recursive),
+                              args.stride, args.start, args.end, args.fps)
+        if not paths:
+            ap.error("no images found")
+        print(f"Creating {len(args.output)} output(s) from {len(paths)} images...")
+        outputs = [parse_output(spec) for spec in args.output]
+        written = make_videos(paths, outputs, args.fps, encoder=args.encoder,
+                              codec=args.codec, crf=args.crf, preset=args.preset,
+                              workers=args.threads, fit=args.fit)
+        for out in outputs:
+            print(f"Video saved as: {out['output']} ({written} frames)")
+        return
+
+    # small prefetch: frames are decoded (and deleted) as soon as they arrive
+    written = make_video(ordered_stream(sys.stdin), args.output, args.fps,
+                         encoder=args.encoder, codec=args.codec, crf=args.crf,
+                         preset=args.preset, workers=2, prefetch=2,
+                         width=args.width, height=args.height, delete=args.delete)
+    print(f"Video saved as: {args.output} ({written} frames)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# ====================================================================
+# slicekit/worker.py
+# --------------------------------------------------------------------
+# Runs one share of a slice plan inside a FLAC3D console (or under the
+# stub itasca module) for slicekit.scheduler. The job file is passed as
+# the first argument or in SLICEKIT_JOB; it names the model state to
+# restore, the jobs to render and the worker number. A summary is
+# written next to it as <job file>.done when the share is finished.
+# ====================================================================
+
+import json
+import os
+import sys
+import time
+
+if __package__ in (None, ""):
+    # run as a file (FLAC3D 'program call'): make the repository root importable
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import itasca as it
+
+from slicekit.jobs import ManifestSet, run_jobs
+from slicekit.manifest import partial_path
+
+
+def main(job_path=None):
+    job_path = job_path or os.environ["SLICEKIT_JOB"]
+    with open(job_path, "r", encoding="utf-8") as f:
+        share = json.load(f)
+
+    t0 = time.perf_counter()
+    if share.get("state"):
+        it.command(f'model restore "{share["state"]}"')
+    t_restore = time.perf_counter() - t0
+
+    worker = share["worker"]
+    manifests = ManifestSet(it, suffix_for=lambda path: partial_path(path, worker))
+    jobs = share["jobs"]
+    _, skipped = run_jobs(it, jobs, resume=share.get("resume", True),
+                          manifests=manifests, label=f"worker {worker}")
+
+    summary = {
+        "worker": worker,
+        "rendered": len(jobs) - skipped,
+        "skipped": skipped,
+        "restore_seconds": t_restore,
+        "seconds": time.perf_counter() - t0,
+    }
+    with open(job_path + ".done", "w", encoding="utf-8") as f:
+        json.dump(summary, f)
+    return summary
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
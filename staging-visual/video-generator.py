@@ -4,12 +4,19 @@
 # Combines exported FLAC3D rotation images (in subfolders) into
 # a single .mp4 video, preserving folder order (01, 02, 03, ...),
 # with optional skipping (e.g., use every Nth image).
+# Same as: python -m slicekit.video make "BASE_FOLDER/*/"
+#              --stride SKIP -o OUTPUT_VIDEO
 # ================================================================
 
-import cv2
 import os
+import sys
+
 import natsort
 
+# repository root, for the shared slicekit helpers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from slicekit.video import collect_frames, make_videos, select_frames
+
 # ------------------------------
 # User configuration
 # ------------------------------
@@ -19,56 +26,44 @@ OUTPUT_VIDEO = "./exports/rotation_z/video.mp4"
 FPS = 1
 EXTENSION = ".png"
 SKIP = 1   # use every Nth image (1 = use all, 2 = every 2nd, 3 = every 3rd, etc.)
+START = None   # optional time range in seconds (at FPS, before SKIP)
+END = None
+PREVIEW_GIF = None    # e.g. "./exports/rotation_z/preview.gif": small preview from the same decode
+PREVIEW_WIDTH = 480
+
+# Encoder: ffmpeg (H.264/H.265) when installed, otherwise OpenCV mp4v
+ENCODER = "auto"      # "auto", "ffmpeg" or "opencv"
+CODEC = "h264"        # "h264" or "h265" (ffmpeg only)
+CRF = 20              # ffmpeg quality: lower = better and larger (18-28 typical)
+PRESET = "medium"     # ffmpeg speed/size trade-off: "ultrafast" ... "veryslow"
+READ_THREADS = 4      # images decoded ahead of the encoder
+
+# Output size: None keeps the image size. Smaller targets are decoded
+# already reduced (1/2, 1/4, 1/8), which is much faster for large images.
+TARGET_WIDTH = None   # e.g. 1920; height follows the aspect ratio unless set
+TARGET_HEIGHT = None
+FIT = "pad"           # frames of another size: "pad" (white), "resize" or "skip"
 
 # ------------------------------
 # Collect subfolders and images
 # ------------------------------
-subfolders = [f for f in os.listdir(BASE_FOLDER)
-              if os.path.isdir(os.path.join(BASE_FOLDER, f))]
-subfolders = natsort.natsorted(subfolders)  # ensure 01, 02, 03, ...
-
-all_images = []
-
-for sub in subfolders:
-    folder_path = os.path.join(BASE_FOLDER, sub)
-    images = [f for f in os.listdir(folder_path)
-              if f.lower().endswith(EXTENSION)]
-    images = natsort.natsorted(images)
-    # apply skip
-    images = images[::SKIP]
-    for img in images:
-        all_images.append(os.path.join(folder_path, img))
+# immediate subfolders in natural order (01, 02, 03, ...), images naturally sorted within each
+subfolders = natsort.natsorted(os.path.join(BASE_FOLDER, f) for f in os.listdir(BASE_FOLDER)
+                               if os.path.isdir(os.path.join(BASE_FOLDER, f)))
+all_images = collect_frames(subfolders, extensions=(EXTENSION,))
+all_images = select_frames(all_images, SKIP, START, END, FPS)
 
 if not all_images:
     raise FileNotFoundError(f"No {EXTENSION} files found in subfolders of {BASE_FOLDER}")
 
 # ------------------------------
-# Determine frame size
-# ------------------------------
-first_image = cv2.imread(all_images[0])
-if first_image is None:
-    raise RuntimeError(f"Unable to read the first image: {all_images[0]}")
-
-height, width, _ = first_image.shape
-
-# ------------------------------
-# Create video writer
-# ------------------------------
-fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-video_writer = cv2.VideoWriter(OUTPUT_VIDEO, fourcc, FPS, (width, height))
-
-# ------------------------------
-# Write frames
+# Decode (prefetched) once, encode every output
 # ------------------------------
+outputs = [{"output": OUTPUT_VIDEO, "width": TARGET_WIDTH, "height": TARGET_HEIGHT}]
+if PREVIEW_GIF:
+    outputs.append({"output": PREVIEW_GIF, "width": PREVIEW_WIDTH})
 print(f"Creating video from {len(all_images)} images... (skip={SKIP})")
 
-for img_path in all_images:
-    frame = cv2.imread(img_path)
-    if frame is None:
-        print(f"Skipping unreadable image: {img_path}")
-        continue
-    video_writer.write(frame)
-    print(f"Added {img_path}")
-
-video_writer.release()
+make_videos(all_images, outputs, FPS, encoder=ENCODER, codec=CODEC, crf=CRF, preset=PRESET,
+            workers=READ_THREADS, fit=FIT)
 print(f"\nVideo saved as: {OUTPUT_VIDEO}")
@@ -0,0 +1,54 @@
+# ====================================================================
+# tests/test_batch_equivalence.py
+# --------------------------------------------------------------------
+# The compiled path (slicekit.batch, one 'program call' per batch) must
+# send FLAC3D exactly the commands of the direct path (slicekit.jobs),
+# checked against the recording stub itasca module.
+# ====================================================================
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "slicekit", "stub"))
+os.environ["SLICEKIT_STUB_LATENCY"] = "0"
+
+import itasca  # noqa: E402  (the stub)
+
+from slicekit import axis_slices, spec  # noqa: E402
+from slicekit.batch import _command_lines, run_batched  # noqa: E402
+from slicekit.jobs import run_jobs  # noqa: E402
+
+
+def _streams(jobs, batch_size):
+    for d in set(os.path.dirname(job["output"]) for job in jobs):
+        os.makedirs(d or ".", exist_ok=True)
+    del itasca.commands[:]
+    run_jobs(itasca, jobs, resume=False)
+    direct = _command_lines(itasca.commands)
+    del itasca.commands[:]
+    run_batched(itasca, jobs, batch_size=batch_size, resume=False)
+    return direct, _command_lines(itasca.commands)
+
+
+@pytest.fixture(autouse=True)
+def scratch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize("single_pass", [False, True])
+def test_axis_plan(single_pass):
+    jobs = axis_slices.plan("z", 980, 990, 2.5, single_pass=single_pass)
+    direct, batched = _streams(jobs, batch_size=7)
+    assert direct and direct == batched
+
+
+def test_slab_sweep():
+    plan, sws = spec.expand(spec.load_spec(os.path.join(ROOT, "slab-review-code", "sweeps.toml")))
+    n = next(n for n, sw in enumerate(sws) if sw["kind"] != "axis")
+    jobs = spec.plan_jobs(plan[plan["sweep"] == n][:12], sws)
+    direct, batched = _streams(jobs, batch_size=5)
+    assert direct and direct == batched